@@ -1,61 +1,93 @@
-import os
-from dotenv import load_dotenv
-from google import genai
-import json
-
-load_dotenv()
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-
-if not GEMINI_API_KEY:
-    raise ValueError("GEMINI_API_KEY not found in .env")
-
-client = genai.Client(api_key=GEMINI_API_KEY)
-
-def analyze_resume(resume_text: str, job_description: str | None) -> dict:
-    job_desc_text = job_description if job_description else "No job description provided."
-
-    prompt = f"""
-You are an ATS resume analyzer.
-
-STRICT RULES:
-- Respond ONLY in valid JSON
-- Do NOT use markdown
-- Do NOT wrap response in ```json
-- Do NOT add explanations outside JSON
-
-Job Description:
-{job_desc_text}
-
-Candidate Resume:
-{resume_text}
-
-Return JSON with the following keys:
-- candidate_name: Full name of the candidate.
-- job_title: Current or target professional title (e.g., Frontend Developer).
-- contact_info: 
-    - email: Candidate's email address.
-    - location: Candidate's city and country/state (e.g., Bengaluru, IN).
-- professional_summary: A 2-3 sentence overview of their experience and key stack.
-- ats_compatibility_score: Integer between 0 and 100.
-- strengths: Array of 3 key professional highlights.
-- weaknesses: Array of 3 areas for improvement.
-- improvement_suggestions: Array of actionable resume tips.
-"""
-
-    response = client.models.generate_content(
-        model="gemini-2.5-flash",
-        contents=prompt
+import asyncio
+
+from app.schemas import ResumeAnalysisOutput, ResumeAssessmentOutput
+from app.services import ats_rules, llm_cache, llm_gateway, prompts
+from app.services.resume_profile import candidate_fields, get_resume_profile, resume_context
+
+PROMPT = prompts.get("analyze_resume")
+# candidate fields come from the profile and the checks from the rules engine,
+# so both are part of the version too
+PROMPT_VERSION = prompts.cache_version("analyze_resume", "resume_profile") + f"+ats_rules:{ats_rules.RULES_VERSION}"
+
+# filled in from the resume profile rather than generated by the analysis call
+_PROFILE_FIELDS = ("candidate_name", "job_title", "contact_info", "professional_summary")
+
+async def analyze_resume(resume_text: str, job_description: str | None, fresh: bool = False) -> dict:
+    return await llm_cache.get_or_compute(
+        "analyze_resume",
+        PROMPT_VERSION,
+        {"resume_text": resume_text, "job_description": job_description},
+        lambda: _analyze_resume(resume_text, job_description),
+        fresh=fresh
+    )
+
+def stream_analyze_resume(resume_text: str, job_description: str | None, fresh: bool = False):
+    """
+    Streaming variant of analyze_resume: yields ("field", (name, value)) events as
+    the analysis is generated, then ("result", dict).
+    """
+    return llm_cache.stream_or_replay(
+        "analyze_resume",
+        PROMPT_VERSION,
+        {"resume_text": resume_text, "job_description": job_description},
+        lambda: _stream_analysis(resume_text, job_description),
+        lambda: analyze_resume(resume_text, job_description, fresh=True),
+        fresh=fresh
     )
 
-    raw_text = response.text.strip()
+def _build_prompt(job_description: str | None, checks: dict) -> str:
+    return PROMPT.render(
+        job_description=job_description or "No job description provided.",
+        ats_score=checks["score"],
+        ats_findings=ats_rules.render_facts(checks)
+    )
+
+def _with_profile(assessment: ResumeAssessmentOutput, profile: dict, checks: dict) -> ResumeAnalysisOutput:
+    return ResumeAnalysisOutput(
+        **assessment.model_dump(),
+        **candidate_fields(profile),
+        professional_summary=profile["experience_summary"],
+        ats_checks=checks
+    )
 
-    if raw_text.startswith("```"):
-        raw_text = raw_text.replace("```json", "").replace("```", "").strip()
+async def _stream_analysis(resume_text: str, job_description: str | None):
+    checks = ats_rules.run_rules(resume_text)
+    # local, so it can go out before the model has produced anything
+    yield "field", ("ats_checks", checks)
+    # the profile is extracted (or loaded) while the assessment streams
+    profile_task = asyncio.ensure_future(get_resume_profile(resume_text))
+    try:
+        stream = llm_gateway.stream_structured(
+            _build_prompt(job_description, checks), ResumeAssessmentOutput,
+            context=resume_context(resume_text), system_instruction=PROMPT.system
+        )
+        async for kind, payload in stream:
+            if kind != "result":
+                yield kind, payload
+                continue
+            result = _with_profile(payload, await profile_task, checks)
+            for name, value in result.model_dump(include=set(_PROFILE_FIELDS)).items():
+                yield "field", (name, value)
+            yield "result", result
+    finally:
+        profile_task.cancel()
+
+async def _analyze_resume(resume_text: str, job_description: str | None) -> dict:
+    checks = ats_rules.run_rules(resume_text)
+    prompt = _build_prompt(job_description, checks)
 
     try:
-        return json.loads(raw_text)
-    except json.JSONDecodeError:
+        profile, assessment = await asyncio.gather(
+            get_resume_profile(resume_text),
+            llm_gateway.generate_structured(
+                prompt, ResumeAssessmentOutput,
+                context=resume_context(resume_text), system_instruction=PROMPT.system
+            )
+        )
+    except llm_gateway.LLMOutputError as e:
         return {
             "error": "Invalid JSON returned by Gemini",
-            "raw_text": response.text
+            "raw_text": e.raw_text
         }
+
+    return _with_profile(assessment, profile, checks).model_dump()
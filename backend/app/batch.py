@@ -0,0 +1,283 @@
+"""
+Offline batch processing of resume files.
+
+    python -m app.batch resumes/ --jd role.txt --output results.csv
+    python -m app.batch manifest.txt --tasks analysis --output results.jsonl
+
+Takes a directory of .txt/.pdf resumes (searched recursively) or a manifest file
+listing one path per line, and runs the analysis and/or job-fit handlers on each
+resume, exactly as the HTTP endpoints do, so results land in the usual tables. Text
+extraction runs in a process pool; LLM work runs on the event loop with at most
+--concurrency resumes in flight.
+
+Every finished file is appended to the output (CSV or JSONL, by extension) and to a
+checkpoint file next to it. Re-running the same command after a crash skips files
+already done and unchanged since, and retries the ones that failed or changed; their
+earlier rows are removed from the output first, so it keeps one row per file.
+"""
+import argparse
+import asyncio
+import csv
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from fastapi.encoders import jsonable_encoder
+
+from app.config import settings
+from app.database import db_executor, init_db
+from app.resume import AnalysisRequest, run_analyze_text
+from app.routes.analysis import JobFitRequest, run_job_fit
+from app.services import llm_gateway
+from app.services.job_queue import describe_error
+
+logger = logging.getLogger("app.batch")
+
+SUFFIXES = (".txt", ".pdf")
+TASKS = ("analysis", "job-fit")
+CSV_FIELDS = (
+    "path", "resume_id", "status", "error", "ats_compatibility_score", "job_fit_score",
+    "candidate_name", "job_title", "email", "matched_skills", "missing_skills",
+    "analysis_id", "fit_analysis_id"
+)
+
+
+def extract_text(path: str) -> str:
+    """
+    Plain text of a .txt or .pdf resume. Runs in a worker process.
+    """
+    if path.lower().endswith(".pdf"):
+        try:
+            import fitz
+        except ImportError:
+            raise RuntimeError("PDF input needs PyMuPDF: pip install pymupdf")
+        with fitz.open(path) as document:
+            return "\n".join(page.get_text() for page in document)
+    return Path(path).read_text(encoding="utf-8", errors="replace")
+
+
+def collect_paths(source: str) -> list[str]:
+    root = Path(source)
+    if root.is_dir():
+        paths = [p for p in root.rglob("*") if p.is_file() and p.suffix.lower() in SUFFIXES]
+    else:
+        lines = [line.strip() for line in root.read_text(encoding="utf-8").splitlines()]
+        paths = [root.parent / line for line in lines if line and not line.startswith("#")]
+    return sorted(str(p.resolve()) for p in paths)
+
+
+def file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def resume_id(path: str, content_hash: str) -> str:
+    # stable per file and content, so a resumed run updates the same rows instead of
+    # adding new ones, while an edited file gets a fresh analysis
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"{Path(path).as_uri()}#{content_hash}"))
+
+
+def fit_analysis_id(resume: str, job_description: str) -> str:
+    # stable per (file, JD), so re-runs update the job-fit row instead of adding one
+    return str(uuid.uuid5(uuid.UUID(resume), hashlib.sha256(job_description.encode("utf-8")).hexdigest()))
+
+
+def load_checkpoint(path: Path) -> set[str]:
+    """
+    Resume ids whose latest checkpoint entry succeeded.
+    """
+    done = {}
+    if path.exists():
+        for line in path.read_text(encoding="utf-8").splitlines():
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # torn last line from a crash
+            if "resume_id" in entry:
+                done[entry["resume_id"]] = entry["status"]
+    return {rid for rid, status in done.items() if status == "ok"}
+
+
+def _drop_rows(output: Path, jsonl: bool, paths: set[str]) -> None:
+    # rewrite the output without the rows of files about to be processed again
+    with output.open(encoding="utf-8", newline="") as f:
+        if jsonl:
+            lines = []
+            for line in f:
+                try:
+                    if json.loads(line)["path"] not in paths:
+                        lines.append(line)
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    continue  # torn last line from a crash
+        else:
+            reader = csv.DictReader(f)
+            rows = [row for row in reader if row.get("path") not in paths]
+    tmp = output.with_name(output.name + ".tmp")
+    with tmp.open("w", encoding="utf-8", newline="") as f:
+        if jsonl:
+            f.writelines(lines)
+        else:
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(rows)
+    os.replace(tmp, output)
+
+
+class ResultWriter:
+    """
+    Appends one row per file to the output and checkpoint, flushing each time so a
+    crash loses at most the files that were in flight. Earlier rows for the files in
+    `redo` (failed or changed since the last run) are dropped on open.
+    """
+
+    def __init__(self, output: Path, checkpoint: Path, redo: set[str] = frozenset()):
+        self.jsonl = output.suffix.lower() != ".csv"
+        new = not output.exists() or output.stat().st_size == 0
+        if redo and not new:
+            _drop_rows(output, self.jsonl, redo)
+        self._output = output.open("a", encoding="utf-8", newline="")
+        self._checkpoint = checkpoint.open("a", encoding="utf-8")
+        if not self.jsonl:
+            self._csv = csv.DictWriter(self._output, fieldnames=CSV_FIELDS, extrasaction="ignore")
+            if new:
+                self._csv.writeheader()
+
+    def write(self, row: dict) -> None:
+        if self.jsonl:
+            self._output.write(json.dumps(jsonable_encoder(row)) + "\n")
+        else:
+            self._csv.writerow(_csv_row(row))
+        self._output.flush()
+        self._checkpoint.write(json.dumps(
+            {"path": row["path"], "resume_id": row["resume_id"], "status": row["status"]}
+        ) + "\n")
+        self._checkpoint.flush()
+
+    def close(self) -> None:
+        self._output.close()
+        self._checkpoint.close()
+
+
+def _csv_row(row: dict) -> dict:
+    analysis = (row.get("analysis") or {}).get("analysis_result") or {}
+    job_fit = row.get("job_fit") or {}
+    candidate = job_fit.get("candidate") or {}
+    fit = job_fit.get("analysis") or {}
+    return {
+        "path": row["path"],
+        "resume_id": row["resume_id"],
+        "status": row["status"],
+        "error": row.get("error"),
+        "ats_compatibility_score": analysis.get("ats_compatibility_score"),
+        "job_fit_score": job_fit.get("score"),
+        "candidate_name": analysis.get("candidate_name") or candidate.get("name"),
+        "job_title": analysis.get("job_title") or candidate.get("title"),
+        "email": (analysis.get("contact_info") or {}).get("email") or candidate.get("email"),
+        "matched_skills": "; ".join(fit.get("matched") or []),
+        "missing_skills": "; ".join(fit.get("missing") or []),
+        "analysis_id": (row.get("analysis") or {}).get("analysis_id"),
+        "fit_analysis_id": job_fit.get("fit_analysis_id")
+    }
+
+
+async def process_file(path: str, rid: str, pool, tasks: tuple, job_description, fresh: bool) -> dict:
+    row = {"path": path, "resume_id": rid, "status": "ok"}
+    try:
+        text = await asyncio.get_running_loop().run_in_executor(pool, extract_text, path)
+        if not text.strip():
+            raise ValueError("no text could be extracted")
+        common = {"id": row["resume_id"], "extracted_text": text, "filename": Path(path).name}
+        # no heuristic fallback: nothing would be left running to upgrade it, so an
+        # outage fails the file and the next run retries it
+        if "analysis" in tasks:
+            row["analysis"] = await run_analyze_text(
+                AnalysisRequest(**common, job_description=job_description), fresh, fallback=False
+            )
+        if "job-fit" in tasks:
+            row["job_fit"] = await run_job_fit(
+                JobFitRequest(**common, job_description_text=job_description), fresh, fallback=False,
+                fit_analysis_id=fit_analysis_id(row["resume_id"], job_description)
+            )
+    except Exception as e:
+        error, _ = describe_error(e)
+        row.update(status="error", error=error["detail"])
+    return row
+
+
+async def run_batch(args) -> dict:
+    paths = collect_paths(args.source)
+    output = Path(args.output)
+    checkpoint = Path(args.checkpoint or f"{args.output}.checkpoint")
+    done = load_checkpoint(checkpoint)
+    ids = {p: resume_id(p, file_hash(p)) for p in paths}
+    pending = [p for p in paths if ids[p] not in done]
+    job_description = Path(args.jd).read_text(encoding="utf-8") if args.jd else None
+    tasks = tuple(args.tasks or (TASKS if job_description else ("analysis",)))
+    logger.info("%d file(s), %d already done, running %s", len(paths), len(paths) - len(pending), ", ".join(tasks))
+
+    queue = asyncio.Queue()
+    for path in pending:
+        queue.put_nowait(path)
+    writer = ResultWriter(output, checkpoint, set(pending))
+    counts = {"ok": 0, "error": 0}
+    started = time.perf_counter()
+
+    async def consume(pool):
+        while not queue.empty():
+            path = queue.get_nowait()
+            row = await process_file(path, ids[path], pool, tasks, job_description, args.fresh)
+            writer.write(row)
+            counts[row["status"]] += 1
+            if row["status"] == "error":
+                logger.warning("%s: %s", row["path"], row["error"])
+            finished = counts["ok"] + counts["error"]
+            if finished % 50 == 0 or finished == len(pending):
+                logger.info("%d/%d done (%d failed), %.1f files/s", finished, len(pending), counts["error"],
+                            finished / (time.perf_counter() - started))
+
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            await asyncio.gather(*(consume(pool) for _ in range(max(1, args.concurrency))))
+    finally:
+        writer.close()
+        await llm_gateway.aclose()
+    return {"total": len(paths), "skipped": len(paths) - len(pending), **counts}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze a folder or manifest of resume files")
+    parser.add_argument("source", help="directory of .txt/.pdf resumes, or a manifest listing one path per line")
+    parser.add_argument("--jd", help="job description file; enables job-fit")
+    parser.add_argument("--tasks", nargs="+", choices=TASKS,
+                        help="default: analysis, plus job-fit when --jd is given")
+    parser.add_argument("--output", default="batch_results.jsonl", help=".csv or .jsonl (appended to, one row per file)")
+    parser.add_argument("--checkpoint", help="default: <output>.checkpoint")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="text-extraction processes")
+    parser.add_argument("--concurrency", type=int, default=settings.worker_concurrency,
+                        help="resumes in flight at once")
+    parser.add_argument("--fresh", action="store_true", help="ignore cached and stored results")
+    args = parser.parse_args()
+    if args.tasks and "job-fit" in args.tasks and not args.jd:
+        parser.error("--tasks job-fit needs --jd")
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+    init_db()
+    try:
+        summary = asyncio.run(run_batch(args))
+        print(json.dumps(summary))
+    except KeyboardInterrupt:
+        print("interrupted; re-run the same command to resume")
+    finally:
+        db_executor.shutdown(wait=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from .models import Resume
+
+
+def ensure_resume(db: Session, resume_id: str, filename: str, extracted_text: str) -> Resume:
+    """
+    Returns the Resume row for `resume_id`, inserting it if missing.
+    Safe against a concurrent request inserting the same id first.
+    """
+    resume = db.query(Resume).filter(Resume.id == resume_id).first()
+    if resume:
+        return resume
+
+    try:
+        with db.begin_nested():
+            resume = Resume(
+                id=resume_id,
+                filename=filename,
+                extracted_text=extracted_text
+            )
+            db.add(resume)
+    except IntegrityError:
+        resume = db.query(Resume).filter(Resume.id == resume_id).one()
+    return resume
@@ -0,0 +1,348 @@
+"""
+Local stand-in for the Gemini REST API, for load and resilience testing.
+
+Serves the subset of the API our services use (generateContent and
+streamGenerateContent with a JSON response schema, and cachedContents) with
+configurable latency, error rates, 429s and truncated output. Point the backend at it with
+
+    GEMINI_BASE_URL=http://127.0.0.1:8090 uvicorn app.main:app
+
+and start it with
+
+    python -m app.fake_gemini --port 8090 --latency-ms 2000 --error-rate 0.02
+
+Fault settings can also be changed at runtime via POST /_fake/config.
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+import time
+import uuid
+from dataclasses import asdict, dataclass
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+@dataclass
+class FakeConfig:
+    latency_ms: float = 1500.0         # mean time to the full (or first streamed) response
+    latency_dist: str = "lognormal"    # fixed | uniform | exponential | lognormal
+    latency_sigma: float = 0.5         # spread for lognormal / uniform (fraction of mean)
+    error_rate: float = 0.0            # fraction of calls answered with a 500/503
+    rate_limit_rate: float = 0.0       # fraction of calls answered with a 429
+    truncate_rate: float = 0.0         # fraction of replies cut off mid-JSON
+    stream_chunk_chars: int = 80
+    stream_chunk_delay_ms: float = 40.0
+    cache_min_tokens: int = 1024       # cachedContents smaller than this are rejected
+    seed: int | None = None
+
+
+config = FakeConfig()
+stats = {"requests": 0, "streams": 0, "errors": 0, "rate_limited": 0, "truncated": 0,
+         "caches_created": 0, "cached_requests": 0}
+# cachedContents/<id> -> {"text", "tokens", "expires_at", "resource"}
+caches: dict[str, dict] = {}
+_rng = random.Random()
+
+app = FastAPI(title="Fake Gemini")
+
+
+def _latency() -> float:
+    mean = config.latency_ms / 1000
+    if config.latency_dist == "fixed":
+        return mean
+    if config.latency_dist == "uniform":
+        spread = mean * config.latency_sigma
+        return max(0.0, _rng.uniform(mean - spread, mean + spread))
+    if config.latency_dist == "exponential":
+        return _rng.expovariate(1 / mean) if mean > 0 else 0.0
+    # lognormal with the configured mean
+    if mean <= 0:
+        return 0.0
+    sigma = config.latency_sigma
+    return _rng.lognormvariate(math.log(mean) - sigma * sigma / 2, sigma)
+
+
+def _error_response(code: int, status: str, message: str) -> JSONResponse:
+    return JSONResponse(
+        status_code=code,
+        content={"error": {"code": code, "message": message, "status": status}},
+    )
+
+
+def _injected_fault() -> JSONResponse | None:
+    roll = _rng.random()
+    if roll < config.rate_limit_rate:
+        stats["rate_limited"] += 1
+        return _error_response(429, "RESOURCE_EXHAUSTED", "Resource has been exhausted (fake).")
+    if roll < config.rate_limit_rate + config.error_rate:
+        stats["errors"] += 1
+        code = _rng.choice([500, 503])
+        status = "INTERNAL" if code == 500 else "UNAVAILABLE"
+        return _error_response(code, status, "The model is overloaded (fake).")
+    return None
+
+
+# --- Synthetic output ---
+
+def _prompt_text(body: dict) -> str:
+    parts = [part.get("text", "") for part in (body.get("systemInstruction") or {}).get("parts", [])]
+    for content in body.get("contents", []):
+        for part in content.get("parts", []):
+            parts.append(part.get("text", ""))
+    return "\n".join(parts)
+
+
+def _tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def _cached_entry(name: str | None) -> dict | None:
+    entry = caches.get(name) if name else None
+    if entry and entry["expires_at"] < time.time():
+        del caches[name]
+        return None
+    return entry
+
+
+def _words(text: str, count: int) -> str:
+    vocabulary = [w.strip(".,:;()[]{}\"'") for w in text.split() if len(w) > 3][:400] or ["sample"]
+    return " ".join(_rng.choice(vocabulary) for _ in range(count))
+
+
+def _synthesize(schema: dict, name: str, prompt: str):
+    kind = str(schema.get("type", "STRING")).upper()
+    if schema.get("nullable") and _rng.random() < 0.1:
+        return None
+    if kind == "OBJECT":
+        properties = schema.get("properties", {})
+        order = schema.get("propertyOrdering") or list(properties)
+        return {key: _synthesize(properties[key], key, prompt) for key in order}
+    if kind == "ARRAY":
+        low = int(schema.get("minItems", 3))
+        high = max(low, int(schema.get("maxItems", low + 2)))
+        return [_synthesize(schema.get("items", {}), name, prompt) for _ in range(_rng.randint(low, high))]
+    if kind == "INTEGER":
+        low = int(schema.get("minimum", 0))
+        high = int(schema.get("maximum", 100))
+        return _rng.randint(low, high)
+    if kind == "NUMBER":
+        return round(_rng.uniform(float(schema.get("minimum", 0)), float(schema.get("maximum", 1))), 3)
+    if kind == "BOOLEAN":
+        return _rng.random() < 0.5
+    if schema.get("enum"):
+        return _rng.choice(schema["enum"])
+    return f"{name.replace('_', ' ')}: {_words(prompt, 6)}"
+
+
+def _mcq_set(prompt: str) -> dict:
+    mcqs = []
+    for n in range(10):
+        options = [f"Option {k + 1}: {_words(prompt, 4)}" for k in range(4)]
+        mcqs.append({
+            "question": f"Question {n + 1}: {_words(prompt, 10)}?",
+            "options": options,
+            "answer": _rng.choice(options),
+        })
+    return {"mcqs": mcqs}
+
+
+def _synthetic_output(body: dict, cached_text: str = "") -> str:
+    generation_config = body.get("generationConfig", {})
+    schema = generation_config.get("responseSchema")
+    prompt = f"{cached_text}\n{_prompt_text(body)}"
+    if not schema:
+        return f"Fake Gemini reply: {_words(prompt, 30)}"
+
+    title = schema.get("items", {}).get("title") or schema.get("title")
+    if title == "MCQSetOutput":
+        # the answer has to be one of the options, which a plain schema walk can't know
+        value = _mcq_set(prompt)
+    elif title and title.endswith("BatchItemOutput"):
+        # one entry per <item id="..."> block of a batched prompt
+        value = []
+        for item_id in re.findall(r'<item id="([^"]+)">', prompt):
+            item = _synthesize(schema["items"], "item", prompt)
+            item["item_id"] = item_id
+            if title == "MCQBatchItemOutput":
+                item["mcqs"] = _mcq_set(prompt)["mcqs"]
+            value.append(item)
+    else:
+        value = _synthesize(schema, title or "value", prompt)
+    return json.dumps(value, indent=1)
+
+
+def _maybe_truncate(text: str) -> str:
+    if _rng.random() < config.truncate_rate:
+        stats["truncated"] += 1
+        return text[: _rng.randint(1, max(1, len(text) - 1))]
+    return text
+
+
+def _response(text: str, model: str, prompt_tokens: int, finished: bool = True, cached_tokens: int = 0) -> dict:
+    candidate = {"content": {"role": "model", "parts": [{"text": text}]}, "index": 0}
+    if finished:
+        candidate["finishReason"] = "STOP"
+    output_tokens = _tokens(text)
+    usage = {
+        "promptTokenCount": prompt_tokens,
+        "candidatesTokenCount": output_tokens,
+        "totalTokenCount": prompt_tokens + output_tokens,
+    }
+    if cached_tokens:
+        usage["cachedContentTokenCount"] = cached_tokens
+    return {"candidates": [candidate], "usageMetadata": usage, "modelVersion": model}
+
+
+# --- Routes ---
+
+@app.post("/{version}/models/{model_action}")
+async def model_action(version: str, model_action: str, request: Request):
+    model, _, action = model_action.partition(":")
+    body = await request.json()
+    stats["requests"] += 1
+
+    cached_text, cached_tokens = "", 0
+    if body.get("cachedContent"):
+        entry = _cached_entry(body["cachedContent"])
+        if entry is None:
+            return _error_response(403, "PERMISSION_DENIED",
+                                   f"CachedContent not found (or permission denied): {body['cachedContent']}")
+        stats["cached_requests"] += 1
+        cached_text, cached_tokens = entry["text"], entry["tokens"]
+    prompt_tokens = _tokens(_prompt_text(body)) + cached_tokens
+
+    if action == "generateContent":
+        await asyncio.sleep(_latency())
+        fault = _injected_fault()
+        if fault:
+            return fault
+        text = _maybe_truncate(_synthetic_output(body, cached_text))
+        return _response(text, model, prompt_tokens, cached_tokens=cached_tokens)
+
+    if action == "streamGenerateContent":
+        stats["streams"] += 1
+        await asyncio.sleep(_latency())
+        fault = _injected_fault()
+        if fault:
+            return fault
+        text = _maybe_truncate(_synthetic_output(body, cached_text))
+
+        async def events():
+            size = max(1, config.stream_chunk_chars)
+            for start in range(0, len(text), size):
+                if start:
+                    await asyncio.sleep(config.stream_chunk_delay_ms / 1000)
+                last = start + size >= len(text)
+                payload = _response(text[start:start + size], model, prompt_tokens,
+                                    finished=last, cached_tokens=cached_tokens)
+                yield f"data: {json.dumps(payload)}\r\n\r\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return _error_response(404, "NOT_FOUND", f"Unsupported action: {action}")
+
+
+@app.post("/{version}/cachedContents")
+async def create_cached_content(version: str, request: Request):
+    body = await request.json()
+    text = _prompt_text(body)
+    tokens = _tokens(text)
+    if tokens < config.cache_min_tokens:
+        return _error_response(
+            400, "INVALID_ARGUMENT",
+            f"Cached content is too small. total_token_count={tokens}, min_total_token_count={config.cache_min_tokens}"
+        )
+    ttl = float(str(body.get("ttl", "3600s")).rstrip("s"))
+    name = f"cachedContents/{uuid.uuid4().hex[:12]}"
+    now = time.time()
+    resource = {
+        "name": name,
+        "displayName": body.get("displayName", ""),
+        "model": body.get("model"),
+        "createTime": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now)),
+        "updateTime": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now)),
+        "expireTime": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now + ttl)),
+        "usageMetadata": {"totalTokenCount": tokens},
+    }
+    caches[name] = {"text": text, "tokens": tokens, "expires_at": now + ttl, "resource": resource}
+    stats["caches_created"] += 1
+    return resource
+
+
+@app.get("/{version}/cachedContents/{cache_id}")
+async def get_cached_content(version: str, cache_id: str):
+    entry = _cached_entry(f"cachedContents/{cache_id}")
+    if entry is None:
+        return _error_response(404, "NOT_FOUND", "CachedContent not found")
+    return entry["resource"]
+
+
+@app.delete("/{version}/cachedContents/{cache_id}")
+async def delete_cached_content(version: str, cache_id: str):
+    if caches.pop(f"cachedContents/{cache_id}", None) is None:
+        return _error_response(404, "NOT_FOUND", "CachedContent not found")
+    return {}
+
+
+@app.get("/_fake/config")
+async def get_config():
+    return {"config": asdict(config), "stats": stats}
+
+
+@app.post("/_fake/config")
+async def update_config(request: Request):
+    """
+    Updates fault-injection settings, e.g. {"error_rate": 0.2, "latency_ms": 500}.
+    """
+    changes = await request.json()
+    for key, value in changes.items():
+        if hasattr(config, key):
+            current = getattr(config, key)
+            setattr(config, key, value if current is None or value is None else type(current)(value))
+    if config.seed is not None:
+        _rng.seed(config.seed)
+    return {"config": asdict(config)}
+
+
+@app.post("/_fake/reset-stats")
+async def reset_stats():
+    for key in stats:
+        stats[key] = 0
+    return stats
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Fake Gemini API server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency-ms", type=float, default=config.latency_ms)
+    parser.add_argument("--latency-dist", default=config.latency_dist,
+                        choices=["fixed", "uniform", "exponential", "lognormal"])
+    parser.add_argument("--latency-sigma", type=float, default=config.latency_sigma)
+    parser.add_argument("--error-rate", type=float, default=config.error_rate)
+    parser.add_argument("--rate-limit-rate", type=float, default=config.rate_limit_rate)
+    parser.add_argument("--truncate-rate", type=float, default=config.truncate_rate)
+    parser.add_argument("--stream-chunk-chars", type=int, default=config.stream_chunk_chars)
+    parser.add_argument("--stream-chunk-delay-ms", type=float, default=config.stream_chunk_delay_ms)
+    parser.add_argument("--cache-min-tokens", type=int, default=config.cache_min_tokens)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    for key, value in vars(args).items():
+        if hasattr(config, key):
+            setattr(config, key, value)
+    if config.seed is not None:
+        _rng.seed(config.seed)
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,33 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from anyio import to_thread
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from .database import engine, Base
+from fastapi.responses import JSONResponse
+from google.genai import errors as genai_errors
+from . import metrics
+from .config import settings
+from .database import db_executor, init_db
+from .services import llm_gateway
+from .services.admission import AdmissionRejected
+from .services.job_queue import job_manager
+from .services.llm_errors import LLMUnavailableError
 from .resume import router as resume_router
-from app.routes import analysis, mcq
+from app.routes import analysis, mcq, jobs, report, screening
 from app.routes.job_match_routes import router as job_router
 
-Base.metadata.create_all(bind=engine)
+init_db()
 
-app = FastAPI(title="ATSLaunchPod Backend")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Sync (def) endpoints such as the PDF download run on this pool
+    to_thread.current_default_thread_limiter().total_tokens = settings.threadpool_size
+    job_manager.start()
+    yield
+    await job_manager.stop()
+    await llm_gateway.aclose()
+    db_executor.shutdown(wait=False)
+
+app = FastAPI(title="ATSLaunchPod Backend", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -17,11 +37,36 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected_handler(request: Request, exc: AdmissionRejected):
+    return JSONResponse(
+        status_code=429,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+@app.exception_handler(LLMUnavailableError)
+async def llm_unavailable_handler(request: Request, exc: LLMUnavailableError):
+    headers = {"Retry-After": str(exc.retry_after)} if exc.retry_after else None
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers=headers)
+
+@app.exception_handler(genai_errors.APIError)
+async def gemini_error_handler(request: Request, exc: genai_errors.APIError):
+    # non-retryable upstream errors (bad request, auth, quota configuration)
+    return JSONResponse(status_code=502, content={"detail": f"Gemini request failed: {exc.message or exc}"})
+
 @app.get("/")
 async def root():
     return {"message": "ATSLaunchPod API is running"}
 
+@app.get("/metrics")
+async def get_metrics():
+    return metrics.snapshot()
+
 app.include_router(resume_router)
 app.include_router(analysis.router)
 app.include_router(mcq.router)
 app.include_router(job_router)
+app.include_router(report.router)
+app.include_router(screening.router)
+app.include_router(jobs.router)
@@ -0,0 +1,24 @@
+import threading
+from collections import defaultdict
+
+_lock = threading.Lock()
+_counters: dict[str, float] = defaultdict(float)
+_gauges: dict[str, float] = {}
+
+
+def incr(name: str, value: float = 1) -> None:
+    with _lock:
+        _counters[name] += value
+
+
+def set_gauge(name: str, value: float) -> None:
+    with _lock:
+        _gauges[name] = value
+
+
+def snapshot() -> dict:
+    """
+    Returns a point-in-time copy of all counters and gauges.
+    """
+    with _lock:
+        return {"counters": dict(_counters), "gauges": dict(_gauges)}
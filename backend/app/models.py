@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, JSON, ForeignKey, DateTime, Integer, Text
+from sqlalchemy import Column, String, JSON, ForeignKey, DateTime, Integer, Text, Boolean, Float, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from .database import Base
@@ -20,6 +20,9 @@ class ResumeAnalysis(Base):
     resume_id = Column(String, ForeignKey("resumes.id"))
     job_description_id = Column(String, ForeignKey("job_descriptions.id"), nullable=True)
     analysis_result = Column(JSON, nullable=False)
+    # "provisional" while a heuristic result waits for the LLM's; "final" after
+    status = Column(String, nullable=False, default="final", server_default="final")
+    refined_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
     resume = relationship("Resume", back_populates="analysis")
@@ -51,6 +54,12 @@ class JobFitAnalysis(Base):
     candidate_email = Column(String, nullable=True)
     candidate_location = Column(String, nullable=True)
 
+    # "heuristic" rows were computed locally and are replaced once the LLM answers
+    source = Column(String, nullable=False, default="llm", server_default="llm")
+    # "provisional" while a heuristic result waits for the LLM's; "final" after
+    status = Column(String, nullable=False, default="final", server_default="final")
+    refined_at = Column(DateTime, nullable=True)
+
     created_at = Column(DateTime, default=datetime.utcnow)
 
 class MCQ(Base):
@@ -74,3 +83,49 @@ class JobMatch(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
     resume = relationship("Resume")
+
+class LLMCacheEntry(Base):
+    __tablename__ = "llm_cache"
+
+    key = Column(String(64), primary_key=True)
+    task = Column(String, nullable=False, index=True)
+    model = Column(String, nullable=False)
+    prompt_version = Column(String, nullable=False)
+    result = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+class Task(Base):
+    __tablename__ = "tasks"
+    __table_args__ = (Index("ix_tasks_claim", "status", "available_at"),)
+
+    id = Column(String, primary_key=True)
+    kind = Column(String, nullable=False)
+    payload = Column(JSON, nullable=False)
+    fresh = Column(Boolean, nullable=False, default=False)
+    # queued -> running -> succeeded | failed, or dead once max_attempts is used up
+    status = Column(String, nullable=False, default="queued")
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False)
+    # queued: earliest time it may be claimed; running: when its lease expires
+    available_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    worker_id = Column(String, nullable=True)
+    # at most one queued or running task per key (e.g. the upgrade of one result)
+    dedupe_key = Column(String, nullable=True, index=True)
+    result = Column(JSON, nullable=True)
+    error = Column(JSON, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    queue_seconds = Column(Float, nullable=True)
+    run_seconds = Column(Float, nullable=True)
+
+class ResumeProfile(Base):
+    __tablename__ = "resume_profiles"
+
+    content_hash = Column(String(64), primary_key=True)
+    prompt_version = Column(String, nullable=False)
+    model = Column(String, nullable=False)
+    profile = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
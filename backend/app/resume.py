@@ -1,9 +1,16 @@
+from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from typing import Optional
-from .database import get_db
+from .crud import ensure_resume
+from .database import get_db, run_db, with_session
 from .models import Resume, ResumeAnalysis
-from .analyze import analyze_resume
+from .analyze import analyze_resume, stream_analyze_resume
+from .sse import sse_event, sse_response, task_events
+from .services import degraded
+from .services.admission import llm_admission
+from .services.heuristics import heuristic_analysis
 from pydantic import BaseModel
 from fastapi.responses import StreamingResponse
 from io import BytesIO
@@ -17,39 +24,127 @@ class AnalysisRequest(BaseModel):
     filename: str
     job_description: Optional[str] = None
 
-@router.post("/analyze-text")
-async def analyze_text_endpoint(request: AnalysisRequest, db: Session = Depends(get_db)):
-    existing_resume = db.query(Resume).filter(Resume.id == request.id).first()
-    if existing_resume:
-        analysis = db.query(ResumeAnalysis).filter(ResumeAnalysis.id == request.id).first()
-        return {"analysis_id": analysis.id, "analysis_result": analysis.analysis_result}
+def _get_existing_analysis(db: Session, resume_id: str, provisional: bool = False):
+    existing_resume = db.query(Resume).filter(Resume.id == resume_id).first()
+    if not existing_resume:
+        return None
+    analysis = db.query(ResumeAnalysis).filter(ResumeAnalysis.id == resume_id).first()
+    if not analysis:
+        return None
+    if analysis.status == "provisional" and not provisional:
+        # a heuristic stand-in; try the LLM again
+        return None
+    return {"analysis_id": analysis.id, "analysis_result": analysis.analysis_result, "status": analysis.status}
 
-    resume = Resume(
-        id=request.id,
-        filename=request.filename,
-        extracted_text=request.extracted_text
-    )
-    db.add(resume)
+def _save_resume(db: Session, request: AnalysisRequest):
+    ensure_resume(db, request.id, request.filename, request.extracted_text)
     db.commit()
 
-    analysis_json = analyze_resume(
-        resume_text=request.extracted_text,
-        job_description=request.job_description
-    )
-
+def _save_analysis(db: Session, request: AnalysisRequest, analysis_json: dict):
+    status = degraded.status(analysis_json)
+    previous = db.query(ResumeAnalysis.status).filter(ResumeAnalysis.id == request.id).scalar()
     analysis = ResumeAnalysis(
         id=request.id,
-        resume_id=resume.id,
-        analysis_result=analysis_json
+        resume_id=request.id,
+        analysis_result=analysis_json,
+        status=status,
+        refined_at=datetime.utcnow() if status == "final" and previous == "provisional" else None
     )
-    db.add(analysis)
-    db.commit()
+    try:
+        db.merge(analysis)
+        db.commit()
+    except IntegrityError:
+        # a concurrent request for the same id inserted first; update that row instead
+        db.rollback()
+        db.merge(analysis)
+        db.commit()
+
+async def run_analyze_text(request: AnalysisRequest, fresh: bool = False, deadline: Optional[float] = None,
+                           fallback: bool = True, progressive: bool = False) -> dict:
+    if not fresh:
+        existing = await run_db(with_session, _get_existing_analysis, request.id, progressive)
+        if existing and existing["status"] == "provisional":
+            # served progressively before; make sure its refinement is still on the way
+            await degraded.schedule_upgrade("analysis-upgrade", request.model_dump(), request.id, delay=0)
+        if existing:
+            return existing
+
+    await run_db(with_session, _save_resume, request)
+
+    if progressive:
+        # answer with the local analysis now and refine it with the LLM right away
+        analysis_json, is_heuristic = heuristic_analysis(request.extracted_text, request.job_description), True
+    else:
+        analysis_json, is_heuristic = await degraded.call_with_fallback(
+            "analyze_resume",
+            lambda: analyze_resume(
+                resume_text=request.extracted_text,
+                job_description=request.job_description,
+                fresh=fresh
+            ),
+            lambda: heuristic_analysis(request.extracted_text, request.job_description),
+            deadline,
+            allow=fallback
+        )
+    if "error" in analysis_json:
+        raise HTTPException(status_code=503, detail=analysis_json["error"])
+
+    await run_db(with_session, _save_analysis, request, analysis_json)
+    if is_heuristic:
+        await degraded.schedule_upgrade(
+            "analysis-upgrade", request.model_dump(), request.id, delay=0 if progressive else None
+        )
 
     return {
         "analysis_id": request.id,
-        "analysis_result": analysis_json
+        "analysis_result": analysis_json,
+        "status": degraded.status(analysis_json)
     }
 
+async def run_analysis_upgrade(request: AnalysisRequest, fresh: bool = False) -> dict:
+    # replaces a heuristic analysis; fails (and is retried) rather than degrading again
+    return await run_analyze_text(request, fresh, fallback=False)
+
+@router.post("/analyze-text")
+async def analyze_text_endpoint(request: AnalysisRequest, fresh: bool = False, deadline: Optional[float] = None,
+                                progressive: bool = False):
+    return await run_analyze_text(request, fresh, deadline, progressive=progressive)
+
+@router.post("/analyze-text/stream")
+async def analyze_text_stream(request: AnalysisRequest, fresh: bool = False, progressive: bool = False):
+    existing = None if fresh else await run_db(with_session, _get_existing_analysis, request.id)
+    if not existing:
+        llm_admission.check()
+        await run_db(with_session, _save_resume, request)
+
+    async def save(analysis_json: dict) -> dict:
+        await run_db(with_session, _save_analysis, request, analysis_json)
+        return {"analysis_id": request.id, "analysis_result": analysis_json, "status": degraded.status(analysis_json)}
+
+    async def events():
+        if existing:
+            for name, value in existing["analysis_result"].items():
+                yield sse_event("field", {"name": name, "value": value})
+            yield sse_event("result", existing)
+            return
+
+        if progressive:
+            # the local analysis first; the LLM's fields and result follow
+            yield sse_event("provisional", {
+                "analysis_id": request.id,
+                "analysis_result": heuristic_analysis(request.extracted_text, request.job_description),
+                "status": "provisional"
+            })
+        stream = stream_analyze_resume(
+            resume_text=request.extracted_text,
+            job_description=request.job_description,
+            fresh=fresh
+        )
+        async for event in task_events(stream, save):
+            yield event
+
+    return sse_response(events())
+
 @router.get("/analysis/{analysis_id}")
 def get_analysis(analysis_id: str, db: Session = Depends(get_db)):
     analysis = db.query(ResumeAnalysis).filter(ResumeAnalysis.id == analysis_id).first()
@@ -61,7 +156,9 @@ def get_analysis(analysis_id: str, db: Session = Depends(get_db)):
         "resume_id": analysis.resume_id,
         "job_description_id": analysis.job_description_id,
         "analysis_result": analysis.analysis_result,
-        "created_at": analysis.created_at
+        "status": analysis.status,
+        "created_at": analysis.created_at,
+        "refined_at": analysis.refined_at
     }
     
 @router.get("/analysis/{analysis_id}/download-pdf")
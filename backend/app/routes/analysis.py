@@ -1,9 +1,19 @@
+from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
+from typing import List, Optional
 from uuid import uuid4
 from pydantic import BaseModel
-from app.services.job_fit_analyzer import reanalyze_resume
-from app.database import get_db
+from app.config import settings
+from app.services import degraded
+from app.services.fit_scoring import fit_scorer, score_fit
+from app.services.heuristics import heuristic_job_fit
+from app.services.job_fit_analyzer import reanalyze_resume, reanalyze_resume_multi, stream_reanalyze_resume
+from app.crud import ensure_resume
+from app.database import get_db, run_db, with_session
+from app.sse import sse_event, sse_response, task_events
+from app.services.admission import llm_admission
 from app.models import Resume, JobDescription, JobFitAnalysis
 
 router = APIRouter(prefix="/analysis", tags=["Analysis"])
@@ -14,17 +24,60 @@ class JobFitRequest(BaseModel):
     job_description_text: str
     filename: str
 
-@router.post("/analyze-job-fit")
-async def analyze_job_fit(request: JobFitRequest, db: Session = Depends(get_db)):
+class JobFitUpgradeRequest(JobFitRequest):
+    fit_analysis_id: str
+
+class JobDescriptionInput(BaseModel):
+    title: Optional[str] = None
+    description_text: str
+
+class MultiJobFitRequest(BaseModel):
+    id: str
+    extracted_text: str
+    filename: str
+    job_descriptions: List[JobDescriptionInput]
+
+class LocalFitRequest(BaseModel):
+    resumes: List[str]
+    job_descriptions: List[str]
+    explain: bool = False
+
+def _get_resume_text(db: Session, request) -> str:
     resume = db.query(Resume).filter(Resume.id == request.id).first()
-    if not resume:
-        resume = Resume(
-            id=request.id,
-            filename=request.filename,
-            extracted_text=request.extracted_text
+    return str(resume.extracted_text) if resume else request.extracted_text
+
+def _get_provisional_job_fit(db: Session, request: JobFitRequest) -> Optional[JobFitAnalysis]:
+    # a heuristic result for the same resume and JD that is still waiting for the LLM
+    return (
+        db.query(JobFitAnalysis)
+        .join(JobDescription, JobFitAnalysis.job_description_id == JobDescription.id)
+        .filter(
+            JobFitAnalysis.resume_id == request.id,
+            JobFitAnalysis.status == "provisional",
+            JobDescription.description_text == request.job_description_text
         )
-        db.add(resume)
-        db.flush() 
+        .order_by(JobFitAnalysis.created_at.desc())
+        .first()
+    )
+
+def _save_job_fit(db: Session, request: JobFitRequest, job_fit_data: dict,
+                  fit_analysis_id: Optional[str] = None) -> JobFitAnalysis:
+    if fit_analysis_id:
+        # upgrading a heuristic result, or re-running a batch, in place
+        job_fit = db.query(JobFitAnalysis).filter(JobFitAnalysis.id == fit_analysis_id).first()
+        if job_fit:
+            previous = job_fit.status
+            row = _job_fit_row(job_fit.resume_id, job_fit.job_description_id, job_fit_data)
+            for key, value in row.items():
+                if key != "id":
+                    setattr(job_fit, key, value)
+            if previous == "provisional" and job_fit.status == "final":
+                job_fit.refined_at = datetime.utcnow()
+            db.commit()
+            db.refresh(job_fit)
+            return job_fit
+
+    resume = ensure_resume(db, request.id, request.filename, request.extracted_text)
 
     jd_id = str(uuid4())
     job_desc = JobDescription(
@@ -35,34 +88,61 @@ async def analyze_job_fit(request: JobFitRequest, db: Session = Depends(get_db))
     db.add(job_desc)
     db.flush() 
 
-    job_fit_data = reanalyze_resume(
-        resume_text=str(resume.extracted_text),
-        job_description=request.job_description_text
-    )
-
-    fit_analysis_id = str(uuid4())
-    job_fit = JobFitAnalysis(
-        id=fit_analysis_id,
-        resume_id=resume.id,
-        job_description_id=jd_id,
-        job_fit_score=job_fit_data.get("job_fit_score", 0),
-        gap_summary=job_fit_data.get("gap_summary"),
-        strengths=job_fit_data.get("strengths", []),
-        matched_skills=job_fit_data.get("matched_skills", []),
-        missing_skills=job_fit_data.get("missing_skills", []),
-        recommendations=job_fit_data.get("recommendations", []),
-        candidate_name=job_fit_data.get("candidate_name"),
-        candidate_title=job_fit_data.get("job_title"),
-        candidate_email=job_fit_data.get("contact_info", {}).get("email"),
-        candidate_location=job_fit_data.get("contact_info", {}).get("location")
-    )
+    row = _job_fit_row(resume.id, jd_id, job_fit_data)
+    job_fit = JobFitAnalysis(**{**row, "id": fit_analysis_id or row["id"]})
     db.add(job_fit)
     db.commit()
+    db.refresh(job_fit)
+    return job_fit
 
+def _job_fit_row(resume_id: str, jd_id: str, job_fit_data: dict) -> dict:
     return {
-        "fit_analysis_id": fit_analysis_id,
-        "resume_id": request.id,
+        "id": str(uuid4()),
+        "resume_id": resume_id,
+        "job_description_id": jd_id,
+        "job_fit_score": job_fit_data.get("job_fit_score", 0),
+        "gap_summary": job_fit_data.get("gap_summary"),
+        "strengths": job_fit_data.get("strengths", []),
+        "matched_skills": job_fit_data.get("matched_skills", []),
+        "missing_skills": job_fit_data.get("missing_skills", []),
+        "recommendations": job_fit_data.get("recommendations", []),
+        "candidate_name": job_fit_data.get("candidate_name"),
+        "candidate_title": job_fit_data.get("job_title"),
+        "candidate_email": job_fit_data.get("contact_info", {}).get("email"),
+        "candidate_location": job_fit_data.get("contact_info", {}).get("location"),
+        "source": job_fit_data.get("source", "llm"),
+        "status": degraded.status(job_fit_data)
+    }
+
+def _save_job_fits(db: Session, request: MultiJobFitRequest, scored: list) -> list[JobFitAnalysis]:
+    """
+    Bulk-inserts a JobDescription and JobFitAnalysis row per (JD, result) pair,
+    one executemany INSERT per table, and returns the analyses unattached.
+    """
+    resume = ensure_resume(db, request.id, request.filename, request.extracted_text)
+    jd_rows, fit_rows = [], []
+    for job_description, job_fit_data in scored:
+        jd_id = str(uuid4())
+        jd_rows.append({
+            "id": jd_id,
+            "title": job_description.title or "Job Fit Analysis",
+            "description_text": job_description.description_text
+        })
+        fit_rows.append(_job_fit_row(resume.id, jd_id, job_fit_data))
+
+    db.execute(insert(JobDescription), jd_rows)
+    db.execute(insert(JobFitAnalysis), fit_rows)
+    db.commit()
+    return [JobFitAnalysis(**row) for row in fit_rows]
+
+def _job_fit_response(job_fit: JobFitAnalysis) -> dict:
+    return {
+        "fit_analysis_id": job_fit.id,
+        "resume_id": job_fit.resume_id,
         "score": job_fit.job_fit_score,
+        "source": job_fit.source or "llm",
+        "status": job_fit.status or "final",
+        "refined_at": job_fit.refined_at,
         "candidate": {
             "name": job_fit.candidate_name,
             "email": job_fit.candidate_email,
@@ -78,8 +158,154 @@ async def analyze_job_fit(request: JobFitRequest, db: Session = Depends(get_db))
         }
     }
 
+async def run_job_fit(request: JobFitRequest, fresh: bool = False, deadline: Optional[float] = None,
+                      fallback: bool = True, fit_analysis_id: Optional[str] = None, progressive: bool = False) -> dict:
+    resume_text = await run_db(with_session, _get_resume_text, request)
+
+    if fit_analysis_id is None and not fresh:
+        # reuse a pending heuristic row rather than adding one (and an upgrade) per request
+        provisional = await run_db(with_session, _get_provisional_job_fit, request)
+        if provisional:
+            fit_analysis_id = provisional.id
+            if progressive:
+                await _schedule_job_fit_upgrade(request, provisional.id, progressive)
+                return _job_fit_response(provisional)
+
+    if progressive:
+        # answer with the local fit now and refine it with the LLM right away
+        job_fit_data, is_heuristic = heuristic_job_fit(resume_text, request.job_description_text), True
+    else:
+        job_fit_data, is_heuristic = await degraded.call_with_fallback(
+            "job_fit",
+            lambda: reanalyze_resume(
+                resume_text=resume_text,
+                job_description=request.job_description_text,
+                fresh=fresh
+            ),
+            lambda: heuristic_job_fit(resume_text, request.job_description_text),
+            deadline,
+            allow=fallback
+        )
+    if "error" in job_fit_data:
+        raise HTTPException(status_code=503, detail=job_fit_data["error"])
+
+    job_fit = await run_db(with_session, _save_job_fit, request, job_fit_data, fit_analysis_id)
+    if is_heuristic:
+        await _schedule_job_fit_upgrade(request, job_fit.id, progressive)
+    return _job_fit_response(job_fit)
+
+async def _schedule_job_fit_upgrade(request: JobFitRequest, fit_analysis_id: str, progressive: bool) -> None:
+    await degraded.schedule_upgrade(
+        "job-fit-upgrade", {**request.model_dump(), "fit_analysis_id": fit_analysis_id}, fit_analysis_id,
+        delay=0 if progressive else None
+    )
+
+async def run_job_fit_upgrade(request: JobFitUpgradeRequest, fresh: bool = False) -> dict:
+    # replaces a heuristic result in place; fails (and is retried) rather than degrading again
+    return await run_job_fit(request, fresh, fallback=False, fit_analysis_id=request.fit_analysis_id)
+
+async def run_job_fit_multi(request: MultiJobFitRequest, fresh: bool = False) -> dict:
+    if not request.job_descriptions:
+        raise HTTPException(status_code=422, detail="At least one job description is required.")
+    if len(request.job_descriptions) > settings.job_fit_multi_max_jds:
+        raise HTTPException(
+            status_code=422,
+            detail=f"At most {settings.job_fit_multi_max_jds} job descriptions per request."
+        )
+
+    resume_text = await run_db(with_session, _get_resume_text, request)
+    results = await reanalyze_resume_multi(
+        resume_text=resume_text,
+        job_descriptions=[jd.description_text for jd in request.job_descriptions],
+        fresh=fresh
+    )
+
+    scored, failed = [], []
+    for index, (job_description, job_fit_data) in enumerate(zip(request.job_descriptions, results)):
+        if "error" in job_fit_data:
+            failed.append({"index": index, "title": job_description.title, "error": job_fit_data["error"]})
+        else:
+            scored.append((index, job_description, job_fit_data))
+    if not scored:
+        raise HTTPException(status_code=503, detail=failed[0]["error"])
+
+    job_fits = await run_db(
+        with_session, _save_job_fits, request, [(jd, data) for _, jd, data in scored]
+    )
+    ranked = sorted(zip(scored, job_fits), key=lambda pair: pair[1].job_fit_score or 0, reverse=True)
+    return {
+        "resume_id": request.id,
+        "results": [
+            {
+                "rank": rank,
+                "index": index,
+                "title": job_description.title,
+                "job_description_id": job_fit.job_description_id,
+                **_job_fit_response(job_fit)
+            }
+            for rank, ((index, job_description, _), job_fit) in enumerate(ranked, start=1)
+        ],
+        "failed": failed
+    }
+
+@router.post("/analyze-job-fit")
+async def analyze_job_fit(request: JobFitRequest, fresh: bool = False, deadline: Optional[float] = None,
+                          progressive: bool = False):
+    return await run_job_fit(request, fresh, deadline, progressive=progressive)
+
+@router.post("/analyze-job-fit/multi")
+async def analyze_job_fit_multi(request: MultiJobFitRequest, fresh: bool = False):
+    return await run_job_fit_multi(request, fresh)
+
+@router.post("/analyze-job-fit/stream")
+async def analyze_job_fit_stream(request: JobFitRequest, fresh: bool = False, progressive: bool = False):
+    llm_admission.check()
+    resume_text = await run_db(with_session, _get_resume_text, request)
+
+    async def save(job_fit_data: dict) -> dict:
+        job_fit = await run_db(with_session, _save_job_fit, request, job_fit_data)
+        return _job_fit_response(job_fit)
+
+    async def events():
+        if progressive:
+            # the local fit first; the LLM's fields and result follow
+            # (same shape as the result, but not stored, so without an id)
+            provisional = heuristic_job_fit(resume_text, request.job_description_text)
+            response = _job_fit_response(JobFitAnalysis(**_job_fit_row(request.id, None, provisional)))
+            yield sse_event("provisional", {**response, "fit_analysis_id": None})
+        stream = stream_reanalyze_resume(
+            resume_text=resume_text,
+            job_description=request.job_description_text,
+            fresh=fresh
+        )
+        async for event in task_events(stream, save):
+            yield event
+
+    return sse_response(events())
+
+@router.post("/analyze-job-fit/local")
+def analyze_job_fit_local(request: JobFitRequest):
+    return {"resume_id": request.id, **score_fit(request.extracted_text, request.job_description_text)}
+
+@router.post("/local-fit")
+def local_fit(request: LocalFitRequest):
+    pairs = len(request.resumes) * len(request.job_descriptions)
+    if pairs > settings.local_fit_max_pairs:
+        raise HTTPException(
+            status_code=422,
+            detail=f"At most {settings.local_fit_max_pairs} resume x job description pairs per request."
+        )
+    fit = fit_scorer.score_texts(request.resumes, request.job_descriptions)
+    response = {"scores": fit.scores.round(1).tolist()}
+    if request.explain:
+        response["details"] = [
+            [fit.explain(i, j) for j in range(len(request.job_descriptions))]
+            for i in range(len(request.resumes))
+        ]
+    return response
+
 @router.get("/analysis-result/{analysis_id}")
-async def get_analysis_result(analysis_id: str, db: Session = Depends(get_db)):
+def get_analysis_result(analysis_id: str, db: Session = Depends(get_db)):
     result = db.query(JobFitAnalysis).filter(JobFitAnalysis.id == analysis_id).first()
     if not result:
         raise HTTPException(status_code=404, detail="Analysis record not found.")
@@ -2,8 +2,10 @@ from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from app.services.gemini_service import get_job_recommendations
-from app.database import get_db
-from app.models import JobMatch, Resume
+from app.services.llm_errors import LLMError
+from app.crud import ensure_resume
+from app.database import get_db, run_db, with_session
+from app.models import JobMatch
 
 router = APIRouter(prefix="/api/jobs", tags=["Job Match"])
 
@@ -12,44 +14,43 @@ class MatchRequest(BaseModel):
     extracted_text: str
     filename: str
 
-@router.post("/match")
-async def create_job_match(request: MatchRequest, db: Session = Depends(get_db)):
+def _save_matches(db: Session, request: MatchRequest, matches: list):
+    ensure_resume(db, request.id, request.filename, request.extracted_text)
+
+    existing_match = db.query(JobMatch).filter(JobMatch.id == request.id).first()
+    if existing_match:
+        existing_match.match_results = matches
+    else:
+        new_match = JobMatch(
+            id=request.id,
+            resume_id=request.id,
+            filename=request.filename,
+            match_results=matches
+        )
+        db.add(new_match)
+
+    db.commit()
+
+async def run_job_match(request: MatchRequest, fresh: bool = False) -> dict:
     try:
-        resume = db.query(Resume).filter(Resume.id == request.id).first()
-        if not resume:
-            resume = Resume(
-                id=request.id,
-                filename=request.filename,
-                extracted_text=request.extracted_text
-            )
-            db.add(resume)
-            db.flush()
-
-        matches = get_job_recommendations(request.extracted_text)
+        matches = await get_job_recommendations(request.extracted_text, fresh=fresh)
         if isinstance(matches, list) and len(matches) > 0 and "error" in matches[0]:
             raise HTTPException(status_code=500, detail=matches[0]["error"])
 
-        existing_match = db.query(JobMatch).filter(JobMatch.id == request.id).first()
-        if existing_match:
-            existing_match.match_results = matches
-        else:
-            new_match = JobMatch(
-                id=request.id,
-                resume_id=request.id,
-                filename=request.filename,
-                match_results=matches
-            )
-            db.add(new_match)
-
-        db.commit()
+        await run_db(with_session, _save_matches, request, matches)
         return {"id": request.id, "matches": matches}
 
+    except LLMError:
+        raise
     except Exception as e:
-        db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/match")
+async def create_job_match(request: MatchRequest, fresh: bool = False):
+    return await run_job_match(request, fresh)
+
 @router.get("/match/{resume_id}")
-async def get_stored_matches(resume_id: str, db: Session = Depends(get_db)):
+def get_stored_matches(resume_id: str, db: Session = Depends(get_db)):
     record = db.query(JobMatch).filter(JobMatch.id == resume_id).first()
     if not record:
         raise HTTPException(status_code=404, detail="No matches found for this ID")
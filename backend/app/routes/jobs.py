@@ -0,0 +1,99 @@
+import asyncio
+
+from fastapi import APIRouter, Body, HTTPException
+from fastapi.responses import JSONResponse
+from pydantic import ValidationError
+
+from app.config import settings
+from app.database import run_db, with_session
+from app.resume import AnalysisRequest, run_analysis_upgrade, run_analyze_text
+from app.routes.analysis import (
+    JobFitRequest, JobFitUpgradeRequest, MultiJobFitRequest, run_job_fit, run_job_fit_multi, run_job_fit_upgrade
+)
+from app.routes.job_match_routes import MatchRequest, run_job_match
+from app.routes.mcq import MCQRequest, run_generate_mcqs
+from app.routes.report import FullReportRequest, run_full_report
+from app.routes.screening import ScreeningRequest, run_screening
+from app.services import task_queue
+from app.services.job_queue import JobQueueFull, job_manager
+from app.sse import sse_event, sse_response
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+job_manager.register("analyze-text", AnalysisRequest, run_analyze_text)
+job_manager.register("job-fit", JobFitRequest, run_job_fit)
+job_manager.register("job-fit-multi", MultiJobFitRequest, run_job_fit_multi)
+job_manager.register("mcqs", MCQRequest, run_generate_mcqs)
+job_manager.register("job-match", MatchRequest, run_job_match)
+job_manager.register("full-report", FullReportRequest, run_full_report)
+job_manager.register("screening", ScreeningRequest, run_screening)
+# LLM re-runs of heuristic results; they overwrite stored rows, so only
+# degraded.schedule_upgrade may queue them
+job_manager.register("analysis-upgrade", AnalysisRequest, run_analysis_upgrade, internal=True)
+job_manager.register("job-fit-upgrade", JobFitUpgradeRequest, run_job_fit_upgrade, internal=True)
+
+def _load_task(db, job_id: str):
+    task = task_queue.get_task(db, job_id)
+    return task_queue.task_dict(task) if task else None
+
+async def _get_job(job_id: str) -> dict:
+    job = job_manager.get(job_id)
+    if job:
+        return job.to_dict()
+    task = await run_db(with_session, _load_task, job_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return task
+
+@router.post("/{kind}", status_code=202)
+async def submit_job(kind: str, payload: dict = Body(...), fresh: bool = False):
+    if kind not in job_manager.handlers or kind in job_manager.internal:
+        raise HTTPException(status_code=404, detail=f"Unknown job kind: {kind}")
+
+    request_model, _ = job_manager.handlers[kind]
+    try:
+        request = request_model.model_validate(payload)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False))
+
+    if settings.job_backend == "db":
+        job = await run_db(with_session, task_queue.enqueue, kind, request.model_dump(), fresh)
+    else:
+        try:
+            job = job_manager.submit(kind, request, fresh)
+        except JobQueueFull as e:
+            raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+    status_url = f"/jobs/{job.id}"
+    return JSONResponse(
+        status_code=202,
+        content={"job_id": job.id, "status": "queued", "status_url": status_url},
+        headers={"Location": status_url}
+    )
+
+@router.get("/{job_id}")
+async def get_job(job_id: str):
+    return await _get_job(job_id)
+
+@router.get("/{job_id}/events")
+async def job_events(job_id: str):
+    job = await _get_job(job_id)
+
+    async def events():
+        yield sse_event("status", {"job_id": job_id, "status": job["status"]})
+        memory_job = job_manager.get(job_id)
+        if memory_job:
+            await memory_job.finished.wait()
+            final = memory_job.to_dict()
+        else:
+            # tasks run in another process; poll the row until it settles
+            final = job
+            while final["status"] in ("queued", "running"):
+                await asyncio.sleep(settings.worker_poll_interval)
+                final = await _get_job(job_id)
+        if final["status"] == "succeeded":
+            yield sse_event("result", final["result"])
+        else:
+            yield sse_event("error", final["error"])
+
+    return sse_response(events())
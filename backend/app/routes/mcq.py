@@ -4,7 +4,8 @@ from uuid import uuid4
 from pydantic import BaseModel
 from typing import Optional
 
-from ..database import get_db
+from ..crud import ensure_resume
+from ..database import get_db, run_db, with_session
 from .. import models
 from ..services.mcq_generator import generate_mcqs_from_resume
 
@@ -16,23 +17,9 @@ class MCQRequest(BaseModel):
     filename: str
     job_fit_analysis_id: Optional[str] = None
 
-@router.post("/generate-mcqs")
-async def generate_mcqs(request: MCQRequest, db: Session = Depends(get_db)):
-    resume = db.query(models.Resume).filter(models.Resume.id == request.id).first()
-    if not resume:
-        resume = models.Resume(
-            id=request.id,
-            filename=request.filename,
-            extracted_text=request.extracted_text
-        )
-        db.add(resume)
-        db.flush()
+def _save_mcqs(db: Session, request: MCQRequest, mcq_list: list):
+    ensure_resume(db, request.id, request.filename, request.extracted_text)
 
-    ai_response = generate_mcqs_from_resume(request.extracted_text)
-    if "error" in ai_response:
-        raise HTTPException(status_code=503, detail=ai_response["error"])
-
-    mcq_list = ai_response.get("mcqs", [])
     for item in mcq_list:
         new_mcq = models.MCQ(
             id=str(uuid4()),
@@ -50,14 +37,26 @@ async def generate_mcqs(request: MCQRequest, db: Session = Depends(get_db)):
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
+async def run_generate_mcqs(request: MCQRequest, fresh: bool = False) -> dict:
+    ai_response = await generate_mcqs_from_resume(request.extracted_text, fresh=fresh)
+    if "error" in ai_response:
+        raise HTTPException(status_code=503, detail=ai_response["error"])
+
+    mcq_list = ai_response.get("mcqs", [])
+    await run_db(with_session, _save_mcqs, request, mcq_list)
+
     return {
         "resume_id": request.id,
         "count": len(mcq_list),
         "mcqs": ai_response["mcqs"]
     }
 
+@router.post("/generate-mcqs")
+async def generate_mcqs(request: MCQRequest, fresh: bool = False):
+    return await run_generate_mcqs(request, fresh)
+
 @router.get("/get-stored-mcqs/{resume_id}")
-async def get_stored_mcqs(resume_id: str, db: Session = Depends(get_db)):
+def get_stored_mcqs(resume_id: str, db: Session = Depends(get_db)):
     questions = db.query(models.MCQ).filter(models.MCQ.resume_id == resume_id).all()
     if not questions:
         raise HTTPException(status_code=404, detail="No MCQs found for this resume.")
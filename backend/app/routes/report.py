@@ -0,0 +1,110 @@
+import asyncio
+import time
+from typing import Optional
+
+from fastapi import APIRouter
+from pydantic import BaseModel
+
+from app.config import settings
+from app.database import run_db, with_session
+from app.crud import ensure_resume
+from app.resume import AnalysisRequest, run_analyze_text
+from app.routes.analysis import JobFitRequest, run_job_fit
+from app.routes.job_match_routes import MatchRequest, run_job_match
+from app.routes.mcq import MCQRequest, run_generate_mcqs
+from app.services.job_queue import describe_error
+from app.sse import sse_event, sse_response
+
+router = APIRouter(prefix="/report", tags=["Report"])
+
+class FullReportRequest(BaseModel):
+    id: str
+    extracted_text: str
+    filename: str
+    job_description: Optional[str] = None
+
+def _save_resume(db, request: FullReportRequest):
+    ensure_resume(db, request.id, request.filename, request.extracted_text)
+    db.commit()
+
+def _sections(request: FullReportRequest, fresh: bool) -> dict:
+    """
+    The report's sections as un-started coroutine factories, keyed by section name.
+    Each one persists its own result, exactly as its standalone endpoint does.
+    """
+    common = {"id": request.id, "extracted_text": request.extracted_text, "filename": request.filename}
+    sections = {
+        "analysis": lambda: run_analyze_text(
+            AnalysisRequest(**common, job_description=request.job_description), fresh
+        ),
+        "mcqs": lambda: run_generate_mcqs(MCQRequest(**common), fresh),
+        "job_matches": lambda: run_job_match(MatchRequest(**common), fresh)
+    }
+    if request.job_description:
+        sections["job_fit"] = lambda: run_job_fit(
+            JobFitRequest(**common, job_description_text=request.job_description), fresh
+        )
+    return sections
+
+async def _run_section(name: str, factory, deadline: float) -> tuple[str, dict]:
+    started = time.perf_counter()
+    try:
+        result = await asyncio.wait_for(factory(), timeout=deadline)
+        section = {"status": "ok", "result": result}
+    except asyncio.TimeoutError:
+        section = {"status": "timeout", "error": {"status_code": 504, "detail": f"No result within {deadline:g}s"}}
+    except Exception as e:
+        error, _ = describe_error(e)
+        section = {"status": "error", "error": error}
+    section["elapsed"] = round(time.perf_counter() - started, 3)
+    return name, section
+
+async def _report_sections(request: FullReportRequest, fresh: bool, deadline: Optional[float]):
+    """
+    Runs every section concurrently and yields (name, section) as each one lands,
+    so total time is the slowest section rather than the sum.
+    """
+    deadline = deadline or settings.report_task_timeout
+    # saved once up front so the concurrent sections don't all race to insert it
+    await run_db(with_session, _save_resume, request)
+    tasks = [
+        asyncio.create_task(_run_section(name, factory, deadline))
+        for name, factory in _sections(request, fresh).items()
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+
+async def run_full_report(request: FullReportRequest, fresh: bool = False, deadline: Optional[float] = None) -> dict:
+    started = time.perf_counter()
+    sections = {name: section async for name, section in _report_sections(request, fresh, deadline)}
+    return {
+        "resume_id": request.id,
+        "complete": all(section["status"] == "ok" for section in sections.values()),
+        "elapsed": round(time.perf_counter() - started, 3),
+        "sections": sections
+    }
+
+@router.post("/full")
+async def full_report(request: FullReportRequest, fresh: bool = False, deadline: Optional[float] = None):
+    return await run_full_report(request, fresh, deadline)
+
+@router.post("/full/stream")
+async def full_report_stream(request: FullReportRequest, fresh: bool = False, deadline: Optional[float] = None):
+    async def events():
+        started = time.perf_counter()
+        statuses = {}
+        async for name, section in _report_sections(request, fresh, deadline):
+            statuses[name] = section["status"]
+            yield sse_event("section", {"name": name, **section})
+        yield sse_event("done", {
+            "resume_id": request.id,
+            "complete": all(status == "ok" for status in statuses.values()),
+            "elapsed": round(time.perf_counter() - started, 3),
+            "sections": statuses
+        })
+
+    return sse_response(events())
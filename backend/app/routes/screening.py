@@ -0,0 +1,95 @@
+from typing import Optional
+from uuid import uuid4
+
+from fastapi import APIRouter
+from pydantic import BaseModel
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import run_db, with_session
+from app.models import JobDescription, JobFitAnalysis
+from app.routes.analysis import _job_fit_response, _job_fit_row
+from app.services.admission import llm_admission
+from app.services.screening import screen
+from app.sse import sse_event, sse_response
+
+router = APIRouter(prefix="/screening", tags=["Screening"])
+
+class ScreeningRequest(BaseModel):
+    job_description_text: str
+    title: Optional[str] = None
+    top_k: Optional[int] = None
+    concurrency: Optional[int] = None
+
+def _limits(request: ScreeningRequest) -> tuple[int, int]:
+    top_k = min(max(1, request.top_k or settings.screening_top_k), settings.screening_max_top_k)
+    concurrency = min(max(1, request.concurrency or settings.screening_concurrency), settings.screening_concurrency)
+    return top_k, concurrency
+
+def _save_screening(db: Session, request: ScreeningRequest, evaluated: list) -> tuple[str, list[JobFitAnalysis]]:
+    """
+    Stores the JD once and bulk-inserts a JobFitAnalysis row per evaluated resume.
+    """
+    jd_id = str(uuid4())
+    db.add(JobDescription(
+        id=jd_id,
+        title=request.title or "Screening",
+        description_text=request.job_description_text
+    ))
+    db.flush()
+    rows = [_job_fit_row(candidate["resume_id"], jd_id, candidate["job_fit"]) for candidate in evaluated]
+    if rows:
+        db.execute(insert(JobFitAnalysis), rows)
+    db.commit()
+    return jd_id, [JobFitAnalysis(**row) for row in rows]
+
+async def _ranked_results(request: ScreeningRequest, candidates: list) -> dict:
+    evaluated = [candidate for candidate in candidates if "error" not in candidate["job_fit"]]
+    jd_id, job_fits = await run_db(with_session, _save_screening, request, evaluated)
+    ranked = sorted(zip(evaluated, job_fits), key=lambda pair: pair[1].job_fit_score or 0, reverse=True)
+    return {
+        "job_description_id": jd_id,
+        "results": [
+            {
+                "rank": rank,
+                "prefilter_rank": candidate["prefilter_rank"],
+                "prefilter_score": candidate["prefilter_score"],
+                **_job_fit_response(job_fit)
+            }
+            for rank, (candidate, job_fit) in enumerate(ranked, start=1)
+        ],
+        "failed": [
+            {"resume_id": candidate["resume_id"], "error": candidate["job_fit"]["error"]}
+            for candidate in candidates if "error" in candidate["job_fit"]
+        ]
+    }
+
+async def run_screening(request: ScreeningRequest, fresh: bool = False) -> dict:
+    top_k, concurrency = _limits(request)
+    prefilter, candidates = None, []
+    async for kind, payload in screen(request.job_description_text, top_k, concurrency, fresh):
+        if kind == "prefilter":
+            prefilter = payload
+        else:
+            candidates.append(payload)
+    return {"prefilter": prefilter, **await _ranked_results(request, candidates)}
+
+@router.post("/run")
+async def run_screening_endpoint(request: ScreeningRequest, fresh: bool = False):
+    return await run_screening(request, fresh)
+
+@router.post("/stream")
+async def screening_stream(request: ScreeningRequest, fresh: bool = False):
+    llm_admission.check()
+    top_k, concurrency = _limits(request)
+
+    async def events():
+        candidates = []
+        async for kind, payload in screen(request.job_description_text, top_k, concurrency, fresh):
+            if kind == "candidate":
+                candidates.append(payload)
+            yield sse_event(kind, payload)
+        yield sse_event("done", await _ranked_results(request, candidates))
+
+    return sse_response(events())
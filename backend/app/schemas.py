@@ -1,11 +1,17 @@
-from pydantic import BaseModel
-from typing import List
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+from typing import List, Literal, Optional
 
 class MCQ(BaseModel):
     question: str
     options: List[str]
     answer: str
 
+    @model_validator(mode="after")
+    def answer_is_an_option(self):
+        if self.answer not in self.options:
+            raise ValueError("answer must be the exact text of one of the options")
+        return self
+
 class AnalysisResult(BaseModel):
     skills_matched: List[str]
     skills_missing: List[str]
@@ -16,5 +22,89 @@ class AnalysisResult(BaseModel):
     mcqs: List[MCQ]
     job_matches: List[str]
 
-    class Config:
-        orm_mode = True
+    model_config = ConfigDict(from_attributes=True)
+
+# --- Gemini structured outputs ---
+# Each model is sent as the task's response_schema and used to validate the reply.
+# Gemini rejects schemas with default values, so every field here is required.
+
+class ContactInfo(BaseModel):
+    email: Optional[str]
+    location: Optional[str]
+
+class ResumeProfileOutput(BaseModel):
+    candidate_name: str
+    job_title: str
+    contact_info: ContactInfo
+    seniority: Literal["intern", "junior", "mid", "senior", "lead"]
+    skills: List[str]
+    experience_summary: str
+
+# Field order is the order Gemini generates (and streams) the keys in,
+# so the headline score and lists come first. The *Assessment models are what
+# Gemini returns; candidate details are filled in from the stored profile.
+
+class ResumeAssessmentOutput(BaseModel):
+    ats_compatibility_score: int = Field(ge=0, le=100)
+    strengths: List[str]
+    weaknesses: List[str]
+    improvement_suggestions: List[str]
+
+class AtsFinding(BaseModel):
+    rule: str
+    status: Literal["pass", "warn", "fail"]
+    score: int
+    message: str
+
+class AtsChecksOutput(BaseModel):
+    score: int
+    findings: List[AtsFinding]
+
+class ResumeAnalysisOutput(ResumeAssessmentOutput):
+    candidate_name: str
+    job_title: str
+    contact_info: ContactInfo
+    professional_summary: str
+    # computed locally by services.ats_rules, never generated
+    ats_checks: AtsChecksOutput
+    # "heuristic" when computed locally because the LLM was unavailable
+    source: Literal["llm", "heuristic"] = "llm"
+
+class JobFitAssessmentOutput(BaseModel):
+    job_fit_score: int = Field(ge=0, le=100)
+    strengths: List[str]
+    matched_skills: List[str]
+    missing_skills: List[str]
+    gap_summary: str
+    recommendations: List[str]
+
+class JobFitOutput(JobFitAssessmentOutput):
+    candidate_name: str
+    job_title: str
+    contact_info: ContactInfo
+    source: Literal["llm", "heuristic"] = "llm"
+
+class JobFitBatchItemOutput(JobFitAssessmentOutput):
+    item_id: str
+
+class MCQSetOutput(BaseModel):
+    mcqs: List[MCQ]
+
+class JobRecommendationOutput(BaseModel):
+    company: str
+    job_title: str
+    location: str
+    package: str
+    skills_required: List[str]
+    match_score: int = Field(ge=0, le=100)
+    apply_link: str
+
+# Batched calls return one entry per input item, keyed by the item's id.
+
+class MCQBatchItemOutput(BaseModel):
+    item_id: str
+    mcqs: List[MCQ]
+
+class JobRecommendationBatchItemOutput(BaseModel):
+    item_id: str
+    jobs: List[JobRecommendationOutput]
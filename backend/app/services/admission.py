@@ -0,0 +1,111 @@
+import asyncio
+import math
+import time
+from contextlib import asynccontextmanager
+
+from app import metrics
+from app.config import settings
+from app.services.llm_errors import LLMError
+
+
+class AdmissionRejected(LLMError):
+    """
+    Raised when an LLM call cannot be admitted: the wait queue is full or the
+    caller waited longer than the configured maximum. Mapped to HTTP 429.
+    """
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(f"LLM capacity exhausted ({reason}); retry after {retry_after}s")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Bounds concurrent LLM calls to `max_concurrency`, with at most `max_queue`
+    callers waiting for a slot and each waiting at most `max_wait` seconds.
+    """
+
+    def __init__(self, name: str, max_concurrency: int, max_queue: int, max_wait: float):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.active = 0
+        self.queued = 0
+        # moving average of how long an admitted call holds its slot, seeded
+        # with a typical Gemini latency
+        self.avg_service_time = 5.0
+        self._semaphore = None
+        self._loop = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self.active = 0
+            self.queued = 0
+        return self._semaphore
+
+    def retry_after(self) -> int:
+        """
+        Seconds until a new caller would likely get a slot at the current backlog.
+        """
+        backlog = self.queued + 1
+        return max(1, math.ceil(backlog / self.max_concurrency * self.avg_service_time))
+
+    def _reject(self, reason: str):
+        metrics.incr(f"{self.name}.rejected.{reason}")
+        return AdmissionRejected(reason, self.retry_after())
+
+    def check(self) -> None:
+        """
+        Fails fast if a call made now would be rejected for a full queue.
+        """
+        if self.active >= self.max_concurrency and self.queued >= self.max_queue:
+            raise self._reject("queue_full")
+
+    def _publish(self) -> None:
+        metrics.set_gauge(f"{self.name}.active", self.active)
+        metrics.set_gauge(f"{self.name}.queued", self.queued)
+
+    @asynccontextmanager
+    async def slot(self):
+        semaphore = self._get_semaphore()
+        if semaphore.locked():
+            self.check()
+
+        self.queued += 1
+        self._publish()
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout=self.max_wait)
+        except asyncio.TimeoutError:
+            raise self._reject("timeout") from None
+        finally:
+            self.queued -= 1
+
+        waited = time.monotonic() - started
+        metrics.incr(f"{self.name}.admitted")
+        metrics.incr(f"{self.name}.wait_seconds", waited)
+        metrics.set_gauge(f"{self.name}.last_wait_seconds", round(waited, 4))
+
+        self.active += 1
+        self._publish()
+        held_from = time.monotonic()
+        try:
+            yield
+        finally:
+            self.active -= 1
+            semaphore.release()
+            self.avg_service_time += 0.2 * ((time.monotonic() - held_from) - self.avg_service_time)
+            self._publish()
+
+
+llm_admission = AdmissionController(
+    "llm.admission",
+    max_concurrency=settings.llm_max_concurrency,
+    max_queue=settings.llm_max_queue,
+    max_wait=settings.llm_max_queue_wait,
+)
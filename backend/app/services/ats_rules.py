@@ -0,0 +1,213 @@
+"""
+Deterministic ATS formatting checks.
+
+The mechanical part of ATS compatibility (sections, contact details, length,
+bullets, dates, keyword stuffing, extraction noise) is checked locally instead of
+being left to the model. Each rule scores one aspect from 0 to 1; the weighted
+mean is the formatting sub-score. The findings are merged into the analysis
+response and given to the analysis prompt as precomputed facts.
+
+Rules are plain functions registered with @rule; add one by decorating a
+function that takes a ResumeDocument and returns (score, message). Bump
+RULES_VERSION when a rule changes so cached analyses are recomputed.
+"""
+import re
+from collections import Counter
+from typing import Callable, NamedTuple
+
+from app.services.fit_scoring import tokenize
+
+RULES_VERSION = "1"
+
+
+class ResumeDocument:
+    """
+    A resume text split up once for all rules.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        # patterns run on lower-cased text: re.IGNORECASE is several times slower
+        self.lower = text.lower()
+        self.lines = [line.strip() for line in text.splitlines() if line.strip()]
+        self.words = text.split()
+        self.tokens = tokenize(text)
+        self.bullets = [line for line in self.lines if _BULLET.match(line)]
+
+
+class Rule(NamedTuple):
+    name: str
+    weight: float
+    check: Callable[[ResumeDocument], tuple[float, str]]
+
+
+RULES: dict[str, Rule] = {}
+
+
+def rule(name: str, weight: float = 1.0):
+    def register(check):
+        RULES[name] = Rule(name, weight, check)
+        return check
+    return register
+
+
+def _status(score: float) -> str:
+    return "pass" if score >= 0.8 else "warn" if score >= 0.5 else "fail"
+
+
+def run_rules(text: str) -> dict:
+    """
+    Runs every registered rule; returns {"score": 0-100, "findings": [...]}.
+    """
+    document = ResumeDocument(text)
+    findings, total, weights = [], 0.0, 0.0
+    for name, weight, check in RULES.values():
+        score, message = check(document)
+        score = min(max(score, 0.0), 1.0)
+        total += weight * score
+        weights += weight
+        findings.append({"rule": name, "status": _status(score), "score": round(score * 100), "message": message})
+    return {"score": round(100 * total / weights) if weights else 100, "findings": findings}
+
+
+def render_facts(checks: dict) -> str:
+    """
+    The checks as prompt lines, e.g. "- sections (fail): Missing sections: Education".
+    """
+    return "\n".join(
+        f"- {finding['rule']} ({finding['status']}): {finding['message']}" for finding in checks["findings"]
+    )
+
+
+_BULLET = re.compile(r"^(?:[•●▪‣◦○■□➢➤►✓*\-–—]|\d{1,2}[.)])\s*\S")
+_SECTIONS = {
+    "experience": r"(?:work |professional |relevant )?experience|employment(?: history)?|work history|internships?",
+    "education": r"education(?:al background)?|academics?|academic background|qualifications",
+    "skills": r"(?:technical |core |key )?skills|technologies|tech stack|competencies|tools",
+}
+_HEADING = {
+    name: re.compile(rf"^\W*(?:{pattern})(?:\s*(?:&|and)\s*\w+)?\W*$", re.IGNORECASE)
+    for name, pattern in _SECTIONS.items()
+}
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+_PHONE = re.compile(r"(?<!\d)\+?\d[\d ().-]{7,}\d(?!\d)")
+_PROFILE_LINK = re.compile(r"linkedin\.com/|github\.com/|gitlab\.com/|portfolio")
+# dates are found from their years; the text just before or after a year tells the format
+_YEAR = re.compile(r"(?<!\d)(?:19|20)\d{2}(?!\d)")
+_MONTH_BEFORE = re.compile(r"\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?,?\s*'?$")
+_NUMERIC_BEFORE = re.compile(r"(?<!\d)(?:0?[1-9]|1[0-2])[/.-]$")
+_NUMERIC_AFTER = re.compile(r"-(?:0[1-9]|1[0-2])(?!\d)")
+# what may sit between the two years of a range: "2019 - 2021", "2019 to Mar 2021"
+_RANGE_GAP = re.compile(r"\s*(?:-|–|—|to)\s*(?:[a-z]+\.?\s*)?")
+_QUANTIFIED = re.compile(r"\d|%|\$|₹")
+# control characters, replacement and private-use characters, ligatures, and pdfminer's "(cid:NN)" glyph ids
+_NOISE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f\ufffd\ue000-\uf8ff\ufb00-\ufb06]|\(cid:\d+\)")
+
+
+@rule("sections", weight=2.0)
+def sections(document: ResumeDocument):
+    found = {
+        name for line in document.lines if len(line.split()) <= 5
+        for name, heading in _HEADING.items() if heading.match(line)
+    }
+    missing = [name.capitalize() for name in _SECTIONS if name not in found]
+    if not missing:
+        return 1.0, "Experience, Education and Skills sections found."
+    return len(found) / len(_SECTIONS), f"Missing section heading(s): {', '.join(missing)}."
+
+
+@rule("contact_info", weight=1.5)
+def contact_info(document: ResumeDocument):
+    has_email = "@" in document.text and bool(_EMAIL.search(document.text))
+    # at least 10 digits, so "2017-2020" style year ranges don't count
+    has_phone = any(sum(char.isdigit() for char in match.group()) >= 10 for match in _PHONE.finditer(document.text))
+    has_link = bool(_PROFILE_LINK.search(document.lower))
+    score = 0.5 * has_email + 0.3 * has_phone + 0.2 * has_link
+    missing = [
+        label for label, present in (("email", has_email), ("phone", has_phone), ("LinkedIn/GitHub link", has_link))
+        if not present
+    ]
+    return score, f"Missing: {', '.join(missing)}." if missing else "Email, phone and profile link present."
+
+
+@rule("length")
+def length(document: ResumeDocument):
+    words = len(document.words)
+    if 300 <= words <= 1000:
+        return 1.0, f"{words} words."
+    if 150 <= words < 300:
+        return 0.6, f"{words} words; likely too thin to cover experience and skills."
+    if 1000 < words <= 1600:
+        return 0.6, f"{words} words; longer than ATS-friendly resumes (300-1000)."
+    return 0.2, f"{words} words; far outside the ATS-friendly range (300-1000)."
+
+
+@rule("bullet_points")
+def bullet_points(document: ResumeDocument):
+    count = len(document.bullets)
+    if count >= 6:
+        return 1.0, f"{count} bullet points."
+    if count >= 3:
+        return 0.6, f"Only {count} bullet points; describe experience as bulleted achievements."
+    return 0.2, "Few or no bullet points; experience reads as paragraphs."
+
+
+@rule("quantified_impact")
+def quantified_impact(document: ResumeDocument):
+    if not document.bullets:
+        return 0.3, "No bullet points to quantify."
+    share = sum(1 for line in document.bullets if _QUANTIFIED.search(line)) / len(document.bullets)
+    if share >= 0.3:
+        return 1.0, f"{share:.0%} of bullets include numbers."
+    return (0.6 if share >= 0.1 else 0.3), f"Only {share:.0%} of bullets include numbers, metrics or amounts."
+
+
+@rule("date_consistency")
+def date_consistency(document: ResumeDocument):
+    text = document.lower
+    years = list(_YEAR.finditer(text))
+    if not years:
+        return 0.5, "No employment or education dates found."
+
+    formats = set()
+    for year in years:
+        before = text[max(0, year.start() - 12):year.start()]
+        if _MONTH_BEFORE.search(before):
+            formats.add("month name")
+        elif _NUMERIC_BEFORE.search(before) or _NUMERIC_AFTER.match(text, year.end()):
+            formats.add("numeric")
+    reversed_ranges = [
+        f"{start.group()}-{end.group()}" for start, end in zip(years, years[1:])
+        if int(end.group()) < int(start.group()) and _RANGE_GAP.fullmatch(text, start.end(), end.start())
+    ]
+    if reversed_ranges:
+        return 0.3, f"Date range(s) ending before they start: {', '.join(reversed_ranges)}."
+    if len(formats) > 1:
+        return 0.6, "Mixed date formats (month names and numeric); use one format throughout."
+    return 1.0, "Dates are consistent."
+
+
+@rule("keyword_stuffing", weight=1.5)
+def keyword_stuffing(document: ResumeDocument):
+    counts = Counter(document.tokens)
+    token, count = counts.most_common(1)[0] if counts else ("", 0)
+    share = count / len(document.tokens) if document.tokens else 0.0
+    if count > 10 and share > 0.05:
+        return 0.2, f"Repeated keyword '{token}' looks like keyword stuffing."
+    if count > 6 and share > 0.03:
+        return 0.6, f"'{token}' is repeated often; keep keywords natural."
+    return 1.0, "No keyword stuffing."
+
+
+@rule("text_noise")
+def text_noise(document: ResumeDocument):
+    text = document.text
+    noisy = len(_NOISE.findall(text))
+    ratio = noisy / len(text) if text else 0.0
+    if noisy == 0:
+        return 1.0, "No extraction noise."
+    if ratio < 0.002:
+        return 0.8, f"{noisy} garbled character(s) from PDF extraction."
+    if ratio < 0.01:
+        return 0.5, f"{noisy} garbled characters; the PDF may not parse cleanly in ATS software."
+    return 0.1, f"{ratio:.1%} of the text is garbled; ATS software will likely misread this PDF."
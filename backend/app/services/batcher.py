@@ -0,0 +1,130 @@
+import asyncio
+import logging
+
+from google.genai import errors as genai_errors
+from pydantic import ValidationError
+
+from app import metrics
+from app.services.llm_errors import LLMOutputError
+
+logger = logging.getLogger(__name__)
+
+
+def render_batch_items(items: list[str]) -> str:
+    """
+    Renders batch inputs as delimited blocks whose ids are their list positions,
+    which is how batch prompts ask the model to key its results.
+    """
+    return "\n\n".join(f'<item id="{index}">\n{text}\n</item>' for index, text in enumerate(items))
+
+
+def match_batch_results(items, count: int, validate) -> list:
+    """
+    Lines a batched reply's {"item_id": ...} entries up with the `count` inputs.
+    Each entry is passed through `validate`; missing or invalid entries become None.
+    """
+    by_id = {}
+    if isinstance(items, list):
+        for item in items:
+            if isinstance(item, dict) and "item_id" in item:
+                by_id.setdefault(str(item["item_id"]), item)
+
+    results = []
+    for index in range(count):
+        try:
+            results.append(validate(by_id[str(index)]))
+        except (KeyError, TypeError, ValidationError):
+            results.append(None)
+    return results
+
+
+class MicroBatcher:
+    """
+    Collects concurrent requests for the same task for up to `window` seconds (or
+    until `max_size` are waiting) and sends them as one LLM call.
+
+    `run_batch(payloads)` returns one result per payload, in order, with None for
+    any item the batched reply did not answer validly; those items, and every item
+    of a batch whose reply could not be used at all, fall back to
+    `run_single(payload)`. Upstream failures (unavailable, rate limited) are
+    passed to every waiter rather than multiplied into single calls.
+    """
+
+    def __init__(self, name: str, run_batch, run_single, window: float, max_size: int, enabled: bool = True):
+        self.name = name
+        self.run_batch = run_batch
+        self.run_single = run_single
+        self.window = window
+        self.max_size = max_size
+        self.enabled = enabled
+        self._pending: list[tuple[object, asyncio.Future]] = []
+        self._timer = None
+        self._loop = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def submit(self, payload):
+        if not self.enabled or self.max_size <= 1:
+            return await self.run_single(payload)
+
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._pending = []
+            self._timer = None
+
+        future = loop.create_future()
+        self._pending.append((payload, future))
+        if len(self._pending) >= self.max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        # the batch runs to completion for the other callers even if this one goes away
+        return await asyncio.shield(future)
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: list) -> None:
+        payloads = [payload for payload, _ in batch]
+        metrics.incr(f"llm_batch.{self.name}.batches")
+        metrics.incr(f"llm_batch.{self.name}.items", len(batch))
+        metrics.set_gauge(f"llm_batch.{self.name}.last_size", len(batch))
+
+        if len(batch) == 1:
+            results = [None]
+        else:
+            try:
+                results = await self.run_batch(payloads)
+            except (LLMOutputError, genai_errors.ClientError):
+                logger.info("Batched %s call failed; falling back to single calls", self.name, exc_info=True)
+                results = [None] * len(batch)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+
+        retries = [(payload, future) for (payload, future), result in zip(batch, results) if result is None]
+        for (_, future), result in zip(batch, results):
+            if result is not None and not future.done():
+                future.set_result(result)
+        if len(batch) > 1 and retries:
+            metrics.incr(f"llm_batch.{self.name}.fallback", len(retries))
+        await asyncio.gather(*(self._single(payload, future) for payload, future in retries))
+
+    async def _single(self, payload, future: asyncio.Future) -> None:
+        try:
+            result = await self.run_single(payload)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+        else:
+            if not future.done():
+                future.set_result(result)
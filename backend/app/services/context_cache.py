@@ -0,0 +1,114 @@
+import asyncio
+import hashlib
+import logging
+import time
+
+from google.genai import types
+
+from app import metrics
+from app.config import settings
+from app.services.admission import AdmissionRejected, llm_admission
+from app.services.llm_errors import CircuitOpenError
+from app.services.resilience import is_transient, llm_breaker
+from app.services.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+class ContextCache:
+    """
+    Gemini cached-content handles for documents that several calls share (a
+    resume), keyed by content hash. A handle is created on first use and reused
+    until shortly before its TTL runs out; callers fall back to sending the text
+    inline whenever no handle is available (cache disabled, document below the
+    API's minimum size, creation failed, or the handle expired).
+    """
+
+    def __init__(self, ttl: float, min_tokens: int, refresh_margin: float = 30.0, retry_after: float = 60.0):
+        self.ttl = ttl
+        self.min_tokens = min_tokens
+        self.refresh_margin = refresh_margin
+        self.retry_after = retry_after
+        # content hash -> (handle name or None after a failed create, monotonic expiry)
+        self._handles: dict[str, tuple[str | None, float]] = {}
+        self._flight = SingleFlight("context_cache")
+
+    @staticmethod
+    def _key(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    async def get(self, client, model: str, text: str) -> str | None:
+        """
+        Returns the cached-content name for `text`, creating it if needed, or None
+        if the text should be sent inline.
+        """
+        if not settings.llm_context_cache_enabled:
+            return None
+        if len(text) // 4 < self.min_tokens:
+            metrics.incr("llm.context_cache.too_small")
+            return None
+
+        key = self._key(text)
+        entry = self._handles.get(key)
+        if entry and entry[1] > time.monotonic():
+            if entry[0]:
+                metrics.incr("llm.context_cache.hit")
+            return entry[0]
+
+        return await self._flight.do(key, lambda: self._create(client, model, key, text))
+
+    async def _create(self, client, model: str, key: str, text: str) -> str | None:
+        # an upstream call like any other: behind the circuit breaker and admission
+        # control, but never retried, since the text can always go inline instead
+        try:
+            llm_breaker.before_call()
+            async with llm_admission.slot():
+                cached = await client.aio.caches.create(
+                    model=model,
+                    config=types.CreateCachedContentConfig(
+                        contents=[types.Content(role="user", parts=[types.Part(text=text)])],
+                        ttl=f"{int(self.ttl)}s",
+                        display_name=f"resume-{key[:16]}",
+                    ),
+                )
+        except CircuitOpenError:
+            metrics.incr("llm.context_cache.skipped")
+            return None
+        except AdmissionRejected:
+            llm_breaker.release()
+            metrics.incr("llm.context_cache.skipped")
+            return None
+        except asyncio.CancelledError:
+            llm_breaker.release()
+            raise
+        except Exception as e:
+            if is_transient(e):
+                llm_breaker.record_failure()
+            else:
+                llm_breaker.release()
+            # e.g. below the model's minimum cacheable size; don't retry on every call
+            logger.info("Context cache create failed; sending inline", exc_info=True)
+            metrics.incr("llm.context_cache.create_failed")
+            self._handles[key] = (None, time.monotonic() + self.retry_after)
+            return None
+
+        llm_breaker.record_success()
+        metrics.incr("llm.context_cache.created")
+        if cached.usage_metadata and cached.usage_metadata.total_token_count:
+            metrics.incr("llm.tokens.cache_storage", cached.usage_metadata.total_token_count)
+        self._handles[key] = (cached.name, time.monotonic() + self.ttl - self.refresh_margin)
+        self._prune()
+        return cached.name
+
+    def invalidate(self, text: str) -> None:
+        self._handles.pop(self._key(text), None)
+        metrics.incr("llm.context_cache.invalidated")
+
+    def _prune(self) -> None:
+        now = time.monotonic()
+        for key in [key for key, (_, expires) in self._handles.items() if expires <= now]:
+            del self._handles[key]
+        metrics.set_gauge("llm.context_cache.handles", len(self._handles))
+
+
+context_cache = ContextCache(settings.llm_context_cache_ttl, settings.llm_context_cache_min_tokens)
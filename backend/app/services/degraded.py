@@ -0,0 +1,109 @@
+"""
+Heuristic results with the LLM's to follow. With LLM_FALLBACK=heuristic, endpoints
+that have a local equivalent (services.heuristics) serve it when the LLM can't
+answer in time; with ?progressive=true they serve it first regardless. Either
+way the stored result is "provisional" until the scheduled LLM run replaces it.
+"""
+import asyncio
+import logging
+from datetime import datetime
+
+from app import metrics
+from app.config import settings
+from app.database import run_db, with_session
+from app.services import task_queue
+from app.services.admission import AdmissionRejected
+from app.services.job_queue import JobQueueFull, job_manager
+from app.services.llm_errors import LLMUnavailableError
+from app.services.resilience import llm_breaker
+
+logger = logging.getLogger(__name__)
+
+# unreachable, circuit open, over quota or overloaded, out of time
+FALLBACK_ERRORS = (LLMUnavailableError, AdmissionRejected, asyncio.TimeoutError)
+
+
+def enabled() -> bool:
+    return settings.llm_fallback == "heuristic"
+
+
+async def call_with_fallback(task: str, llm_call, heuristic, deadline: float | None = None,
+                             allow: bool = True) -> tuple[dict, bool]:
+    """
+    Returns (result, degraded). Awaits `llm_call()` (within `deadline` seconds, if
+    given) and falls back to the synchronous `heuristic()` if the circuit is open,
+    the deadline is too short for an LLM call, the call fails with one of
+    FALLBACK_ERRORS, or it returns an {"error": ...} result. Without fallback the
+    LLM result or error is passed through unchanged.
+    """
+    if not (allow and enabled()):
+        return await llm_call(), False
+
+    reason = None
+    if llm_breaker.is_open():
+        reason = "circuit_open"
+    elif deadline is not None and deadline < settings.llm_fallback_min_deadline:
+        reason = "deadline"
+    else:
+        try:
+            result = await asyncio.wait_for(llm_call(), deadline)
+        except FALLBACK_ERRORS as e:
+            reason = type(e).__name__
+        else:
+            if "error" not in result:
+                return result, False
+            reason = "invalid_output"
+
+    metrics.incr(f"llm.fallback.{task}")
+    logger.info("Serving heuristic %s (%s)", task, reason)
+    return heuristic(), True
+
+
+def status(result: dict) -> str:
+    return "provisional" if result.get("source") == "heuristic" else "final"
+
+
+# in-process upgrades by key: None while waiting out the delay, then the Job
+_pending: dict = {}
+
+
+def _upgrade_pending(key: str) -> bool:
+    for finished in [k for k, job in _pending.items() if job is not None and job.finished_at is not None]:
+        del _pending[finished]
+    return key in _pending
+
+
+async def schedule_upgrade(kind: str, payload: dict, key: str, delay: float | None = None) -> None:
+    """
+    Queues the LLM version of a heuristic result to run in `delay` seconds
+    (default LLM_UPGRADE_DELAY): as a delayed task with the "db" job backend
+    (retried like any task), otherwise as an in-process job. `key` identifies the
+    result; while an upgrade for it is pending, further requests are no-ops.
+    """
+    if delay is None:
+        delay = settings.llm_upgrade_delay
+    key = f"{kind}:{key}"
+    if settings.job_backend == "db":
+        requested_at = datetime.utcnow()
+        task = await run_db(with_session, task_queue.enqueue, kind, payload, delay=delay, dedupe_key=key)
+        # an older task means one was already pending
+        outcome = "scheduled" if task.created_at >= requested_at else "deduplicated"
+        metrics.incr(f"llm.upgrades.{kind}.{outcome}")
+        return
+
+    if _upgrade_pending(key):
+        metrics.incr(f"llm.upgrades.{kind}.deduplicated")
+        return
+    request_model, _ = job_manager.handlers[kind]
+    request = request_model.model_validate(payload)
+    _pending[key] = None
+    metrics.incr(f"llm.upgrades.{kind}.scheduled")
+
+    def submit():
+        try:
+            _pending[key] = job_manager.submit(kind, request)
+        except JobQueueFull:
+            del _pending[key]
+            logger.warning("Job queue full; dropping %s upgrade", kind)
+
+    asyncio.get_running_loop().call_later(delay, submit)
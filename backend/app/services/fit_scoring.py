@@ -0,0 +1,167 @@
+"""
+Local, reproducible job-fit scoring: no LLM call, the same inputs always give
+the same score.
+
+Each (resume, JD) score blends two sparse-vector similarities:
+- skill coverage: the share of the JD's taxonomy skills (services.skills) the
+  resume mentions;
+- term relevance: BM25 of the resume against the JD's terms, normalised so that a
+  resume of average length mentioning every JD term once scores 1.
+
+Both are computed for a whole (N resumes x M JDs) batch with one sparse matrix
+product each, so scoring thousands of resumes costs one pass of tokenizing plus a
+few milliseconds of linear algebra. IDF weights come from the resumes being scored
+and only kick in once there are enough of them to be meaningful.
+"""
+import re
+from collections import Counter
+from typing import NamedTuple
+
+import numpy as np
+from scipy import sparse
+
+from app.services.skills import skill_matcher
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+_STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it of on or our the to we will with you your
+this that their they who what which all any can must should able work working experience years
+team role job strong good knowledge skills skill using use including etc plus
+required requirements require need needs want preferred nice responsibilities qualifications looking ideal candidate
+""".split())
+
+SKILL_WEIGHT = 0.6
+EXPLAIN_TERMS = 15
+
+
+class TextFeatures(NamedTuple):
+    length: int
+    terms: Counter
+    skills: frozenset
+
+
+def tokenize(text: str) -> list[str]:
+    return [token for token in _TOKEN.findall(text.lower()) if token not in _STOPWORDS and len(token) > 1]
+
+
+def featurize(text: str, vocabulary=None) -> TextFeatures:
+    """
+    Term counts (optionally only those in `vocabulary`, to keep large batches
+    small) and taxonomy skills of one document.
+    """
+    tokens = tokenize(text)
+    terms = Counter(tokens if vocabulary is None else (token for token in tokens if token in vocabulary))
+    return TextFeatures(len(tokens), terms, frozenset(skill_matcher.extract(text)))
+
+
+def _matrix(rows: list, index: dict, shape, counts: bool = False) -> sparse.csr_matrix:
+    """
+    Sparse matrix with (row, index[key]) set for every key in rows[row]: to 1, or
+    to rows[row][key] when `counts` is set. Keys missing from `index` are dropped.
+    """
+    row_ids, col_ids, data = [], [], []
+    for row, keys in enumerate(rows):
+        for key in keys:
+            col = index.get(key)
+            if col is not None:
+                row_ids.append(row)
+                col_ids.append(col)
+                data.append(keys[key] if counts else 1.0)
+    return sparse.csr_matrix((np.array(data, dtype=float), (row_ids, col_ids)), shape=shape)
+
+
+class FitMatrix:
+    """
+    Scores of N resumes against M JDs. `scores[i, j]` is a 0-100 float.
+    """
+
+    def __init__(self, scores, skill_scores, term_scores, resumes, jds, idf: dict):
+        self.scores = scores
+        self.skill_scores = skill_scores
+        self.term_scores = term_scores
+        self._resumes = resumes
+        self._jds = jds
+        self._idf = idf
+
+    def top_k(self, jd_index: int, k: int) -> list[tuple[int, float]]:
+        """
+        The `k` best resumes for one JD as (resume index, score), best first.
+        """
+        column = self.scores[:, jd_index]
+        k = min(k, len(column))
+        if k <= 0:
+            return []
+        best = np.argpartition(-column, k - 1)[:k]
+        best = best[np.argsort(-column[best], kind="stable")]
+        return [(int(i), float(column[i])) for i in best]
+
+    def explain(self, resume_index: int, jd_index: int) -> dict:
+        resume, jd = self._resumes[resume_index], self._jds[jd_index]
+        jd_terms = sorted(jd.terms, key=lambda term: (-self._idf.get(term, 0.0), term))
+        return {
+            "score": int(round(self.scores[resume_index, jd_index])),
+            "skill_score": round(float(self.skill_scores[resume_index, jd_index]) * 100, 1),
+            "term_score": round(float(self.term_scores[resume_index, jd_index]) * 100, 1),
+            "matched_skills": sorted(jd.skills & resume.skills),
+            "missing_skills": sorted(jd.skills - resume.skills),
+            "matched_terms": [term for term in jd_terms if term in resume.terms][:EXPLAIN_TERMS],
+            "missing_terms": [term for term in jd_terms if term not in resume.terms][:EXPLAIN_TERMS]
+        }
+
+
+class FitScorer:
+    def __init__(self, k1: float = 1.2, b: float = 0.75, skill_weight: float = SKILL_WEIGHT, min_idf_docs: int = 20):
+        self.k1 = k1
+        self.b = b
+        self.skill_weight = skill_weight
+        self.min_idf_docs = min_idf_docs
+
+    def score(self, resumes: list[TextFeatures], jds: list[TextFeatures]) -> FitMatrix:
+        n, m = len(resumes), len(jds)
+        vocabulary = {term: col for col, term in enumerate(sorted(set().union(*(jd.terms for jd in jds))))}
+        skills = {skill: col for col, skill in enumerate(sorted(set().union(*(jd.skills for jd in jds))))}
+
+        # BM25 term weights of every resume over the JDs' vocabulary
+        tf = _matrix([resume.terms for resume in resumes], vocabulary, (n, len(vocabulary)), counts=True)
+        lengths = np.array([resume.length for resume in resumes], dtype=float)
+        avgdl = lengths.mean() if n and lengths.mean() > 0 else 1.0
+        df = np.bincount(tf.indices, minlength=len(vocabulary))
+        if n >= self.min_idf_docs:
+            idf = np.log1p((n - df + 0.5) / (df + 0.5))
+        else:
+            idf = np.ones(len(vocabulary))
+        row_norm = np.repeat(1 - self.b + self.b * lengths / avgdl, np.diff(tf.indptr))
+        tf.data = tf.data * (self.k1 + 1) / (tf.data + self.k1 * row_norm)
+
+        query = _matrix([jd.terms for jd in jds], vocabulary, (m, len(vocabulary))).multiply(idf).tocsr()
+        best = np.asarray(query.sum(axis=1)).ravel()
+        term_scores = (tf @ query.T).toarray() / np.where(best > 0, best, 1.0)
+        term_scores = np.clip(term_scores, 0.0, 1.0)
+
+        # share of each JD's skills that each resume mentions
+        resume_skills = _matrix([resume.skills for resume in resumes], skills, (n, len(skills)))
+        jd_skills = _matrix([jd.skills for jd in jds], skills, (m, len(skills)))
+        required = np.asarray(jd_skills.sum(axis=1)).ravel()
+        skill_scores = (resume_skills @ jd_skills.T).toarray() / np.where(required > 0, required, 1.0)
+
+        # JDs that name no taxonomy skills are scored on terms alone
+        weight = np.where(required > 0, self.skill_weight, 0.0)
+        scores = 100.0 * (weight * skill_scores + (1 - weight) * term_scores)
+        idf_by_term = {term: float(idf[col]) for term, col in vocabulary.items()}
+        return FitMatrix(scores, skill_scores, term_scores, resumes, jds, idf_by_term)
+
+    def score_texts(self, resume_texts: list[str], job_descriptions: list[str]) -> FitMatrix:
+        jds = [featurize(text) for text in job_descriptions]
+        vocabulary = set().union(*(jd.terms for jd in jds))
+        return self.score([featurize(text, vocabulary) for text in resume_texts], jds)
+
+
+fit_scorer = FitScorer()
+
+
+def score_fit(resume_text: str, job_description: str) -> dict:
+    """
+    Local fit score (0-100) of one resume against one JD, with matched and
+    missing skills and terms.
+    """
+    return fit_scorer.score_texts([resume_text], [job_description]).explain(0, 0)
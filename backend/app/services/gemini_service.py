@@ -1,67 +1,69 @@
-import os
-import json
-from dotenv import load_dotenv
-from google import genai
+from pydantic import TypeAdapter
 
-load_dotenv()
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+from app.config import settings
+from app.schemas import JobRecommendationBatchItemOutput, JobRecommendationOutput
+from app.services import llm_cache, llm_gateway, prompts
+from app.services.batcher import MicroBatcher, match_batch_results, render_batch_items
+from app.services.resume_profile import JOB_SEARCH_FIELDS, get_resume_profile, render_profile
 
-if not GEMINI_API_KEY:
-    raise ValueError("GEMINI_API_KEY not found in .env")
+PROMPT = prompts.get("job_recommendations")
+BATCH_PROMPT = prompts.get("job_recommendations_batch")
+PROMPT_VERSION = prompts.cache_version("job_recommendations", "job_recommendations_batch", "resume_profile")
 
-client = genai.Client(api_key=GEMINI_API_KEY)
+_jobs_adapter = TypeAdapter(list[JobRecommendationOutput])
 
-def get_job_recommendations(resume_text: str) -> list:
+async def get_job_recommendations(resume_text: str, fresh: bool = False) -> list:
     """
     Analyze resume and return 6 matching job openings using Gemini 2.5 Flash.
     Returns a list of job objects in JSON format.
     """
-    
-    prompt = f"""
-You are an expert ATS (Applicant Tracking System). Analyze the following resume text and find 6 real-world current job openings that match the candidate's skills.
+    return await llm_cache.get_or_compute(
+        "get_job_recommendations",
+        PROMPT_VERSION,
+        {"resume_text": resume_text},
+        lambda: _get_job_recommendations(resume_text),
+        fresh=fresh
+    )
 
-RESUME TEXT:
-{resume_text}
+def _build_prompt(candidate_profile: str) -> str:
+    return PROMPT.render(candidate_profile=candidate_profile)
 
-STRICT RULES:
-- Return ONLY a JSON array.
-- Do NOT use markdown code blocks.
-- Do NOT add text outside JSON.
-- 'package' must be in Lakhs (INR), e.g., "₹18L - ₹25L".
-- 'match_score' must be an integer (0-100).
-- Provide 6 distinct job objects.
+async def _recommend_single(candidate_profile: str) -> list:
+    jobs = await llm_gateway.generate_structured(
+        _build_prompt(candidate_profile), list[JobRecommendationOutput], system_instruction=PROMPT.system
+    )
+    return [job.model_dump() for job in jobs]
 
-JSON STRUCTURE:
-[
-  {{
-    "company": "Company Name",
-    "job_title": "Title",
-    "location": "City, State",
-    "package": "₹24L - ₹32L",
-    "skills_required": ["Skill 1", "Skill 2", "Skill 3", "Skill 4"],
-    "match_score": 94,
-    "apply_link": "URL"
-  }}
-]
-"""
+def _validate_batch_item(item: dict):
+    jobs = _jobs_adapter.validate_python(item["jobs"])
+    # an empty list gets another chance as a single call
+    return [job.model_dump() for job in jobs] or None
 
-    try:
-        response = client.models.generate_content(
-            model="gemini-2.5-flash",
-            contents=prompt,
-            config={'response_mime_type': 'application/json'}
-        )
+async def _recommend_batch(candidate_profiles: list[str]) -> list:
+    items = await llm_gateway.generate_json(
+        BATCH_PROMPT.render(items=render_batch_items(candidate_profiles)),
+        list[JobRecommendationBatchItemOutput],
+        system_instruction=BATCH_PROMPT.system
+    )
+    return match_batch_results(items, len(candidate_profiles), _validate_batch_item)
 
-        if not response or not response.text:
-            return [{"error": "No response text received from Gemini 2.5 Flash"}]
+job_batcher = MicroBatcher(
+    "job_recommendations", _recommend_batch, _recommend_single,
+    window=settings.llm_batch_window,
+    max_size=settings.llm_batch_max_size,
+    enabled=settings.llm_batching_enabled
+)
 
-        raw_text = response.text.strip()
-        if raw_text.startswith("```"):
-            raw_text = raw_text.replace("```json", "").replace("```", "").strip()
+async def _get_job_recommendations(resume_text: str) -> list:
+    try:
+        profile = await get_resume_profile(resume_text)
+        jobs = await job_batcher.submit(render_profile(profile, JOB_SEARCH_FIELDS))
+        if not jobs:
+            return [{"error": "No job matches received from Gemini 2.5 Flash"}]
 
-        return json.loads(raw_text)
+        return jobs
 
-    except Exception as e:
+    except llm_gateway.LLMOutputError as e:
         return [{
             "error": "Failed to fetch job matches",
             "details": str(e)
@@ -0,0 +1,107 @@
+"""
+Analyses computed entirely locally (skill matcher, fit scorer, ATS rules), served
+in place of the LLM's when it is unavailable. Results have the same shape as the
+LLM ones, with source "heuristic".
+"""
+import re
+
+from app.schemas import JobFitOutput, ResumeAnalysisOutput
+from app.services import ats_rules
+from app.services.fit_scoring import score_fit
+from app.services.skills import skill_matcher
+
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+_NAME = re.compile(r"^[A-Za-z][A-Za-z.'-]*(?: [A-Za-z][A-Za-z.'-]*){1,3}$")
+_TITLE = re.compile(
+    r"\b(?:engineer|developer|analyst|manager|designer|scientist|architect|consultant|intern|"
+    r"specialist|administrator|lead|programmer|student|associate)\b",
+    re.IGNORECASE
+)
+
+# what to tell the candidate when a rule does not pass
+_RULE_TIPS = {
+    "sections": "Add clear Experience, Education and Skills headings so ATS parsers can find each section.",
+    "contact_info": "Put your email, phone number and LinkedIn/GitHub link at the top of the resume.",
+    "length": "Keep the resume between roughly 300 and 1000 words.",
+    "bullet_points": "Describe each role as 3-6 bullet points instead of paragraphs.",
+    "quantified_impact": "Quantify achievements with numbers (%, time saved, users, revenue).",
+    "date_consistency": "Use one date format (e.g. 'Jan 2021 - Mar 2023') throughout.",
+    "keyword_stuffing": "Mention each keyword where it is backed by experience rather than repeating it.",
+    "text_noise": "Export the PDF from a text-based editor; parts of it did not extract as readable text.",
+}
+
+
+def guess_candidate(resume_text: str) -> dict:
+    """
+    Best-effort candidate fields from the resume's first lines.
+    """
+    lines = [line.strip() for line in resume_text.splitlines() if line.strip()][:6]
+    name = next((line for line in lines if _NAME.match(line) and not _TITLE.search(line)), None)
+    title = next((line for line in lines if len(line.split()) <= 6 and _TITLE.search(line)), None)
+    email = _EMAIL.search(resume_text)
+    return {
+        "candidate_name": name or "Unknown",
+        "job_title": title or "Not specified",
+        "contact_info": {"email": email.group() if email else None, "location": None}
+    }
+
+
+def heuristic_analysis(resume_text: str, job_description: str | None) -> dict:
+    checks = ats_rules.run_rules(resume_text)
+    skills = skill_matcher.extract(resume_text)
+    candidate = guess_candidate(resume_text)
+    weak = sorted((f for f in checks["findings"] if f["status"] != "pass"), key=lambda f: f["score"])
+    passed = [f for f in checks["findings"] if f["status"] == "pass"]
+
+    score = checks["score"]
+    strengths, weaknesses, suggestions = [], [], [_RULE_TIPS[f["rule"]] for f in weak if f["rule"] in _RULE_TIPS]
+    if skills:
+        strengths.append(f"Lists {len(skills)} recognised skills, including {', '.join(skills[:5])}.")
+    if job_description:
+        fit = score_fit(resume_text, job_description)
+        # same split as the LLM prompt: formatting about 30%, fit to the JD the rest
+        score = round(0.3 * checks["score"] + 0.7 * fit["score"])
+        if fit["matched_skills"]:
+            strengths.append(f"Covers job requirements: {', '.join(fit['matched_skills'][:5])}.")
+        if fit["missing_skills"]:
+            weaknesses.append(f"Job requirements not mentioned: {', '.join(fit['missing_skills'][:5])}.")
+            suggestions.append(f"If you have experience with {', '.join(fit['missing_skills'][:3])}, add it explicitly.")
+    strengths += [f["message"] for f in passed]
+    weaknesses += [f["message"] for f in weak]
+
+    return ResumeAnalysisOutput(
+        ats_compatibility_score=score,
+        strengths=strengths[:3],
+        weaknesses=weaknesses[:3],
+        improvement_suggestions=suggestions[:5],
+        **candidate,
+        professional_summary=(
+            f"{candidate['job_title']} with skills in {', '.join(skills[:8])}." if skills
+            else "No recognised skills found."
+        ),
+        ats_checks=checks,
+        source="heuristic"
+    ).model_dump()
+
+
+def heuristic_job_fit(resume_text: str, job_description: str) -> dict:
+    fit = score_fit(resume_text, job_description)
+    matched, missing = fit["matched_skills"], fit["missing_skills"]
+    required = len(matched) + len(missing)
+    if required:
+        gap_summary = f"The resume mentions {len(matched)} of the {required} skills named in the job description."
+        gap_summary += f" Missing: {', '.join(missing[:5])}." if missing else " No named skills are missing."
+    else:
+        gap_summary = f"The resume covers {len(fit['matched_terms'])} of the job description's key terms."
+
+    return JobFitOutput(
+        job_fit_score=fit["score"],
+        strengths=[f"Experience with {skill}." for skill in matched[:3]] or
+                  [f"Mentions {term}." for term in fit["matched_terms"][:3]],
+        matched_skills=matched,
+        missing_skills=missing,
+        gap_summary=gap_summary,
+        recommendations=[f"Show hands-on experience with {skill}, if you have it." for skill in missing[:5]],
+        **guess_candidate(resume_text),
+        source="heuristic"
+    ).model_dump()
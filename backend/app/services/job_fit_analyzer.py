@@ -1,73 +1,143 @@
-import os
-import json
-from dotenv import load_dotenv
-from google import genai
+import asyncio
 
-load_dotenv()
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+from app.config import settings
+from app.schemas import JobFitAssessmentOutput, JobFitBatchItemOutput, JobFitOutput
+from app.services import llm_cache, llm_gateway, prompts
+from app.services.batcher import match_batch_results, render_batch_items
+from app.services.llm_errors import LLMError
+from app.services.resume_profile import JOB_FIT_FIELDS, candidate_fields, get_resume_profile, render_profile
 
-if not GEMINI_API_KEY:
-    raise ValueError("GEMINI_API_KEY not found in .env")
+PROMPT = prompts.get("job_fit")
+# multi-JD results are cached per (resume, JD) under the single-JD key: both are a
+# JobFitOutput for the same profile and JD, so either endpoint reuses the other's,
+# and an edit to either template invalidates both
+PROMPT_VERSION = prompts.cache_version("job_fit", "job_fit_multi", "resume_profile")
+MULTI_PROMPT = prompts.get("job_fit_multi")
 
-client = genai.Client(api_key=GEMINI_API_KEY)
-
-def reanalyze_resume(resume_text: str, job_description: str) -> dict:
+async def reanalyze_resume(resume_text: str, job_description: str, fresh: bool = False) -> dict:
     """
     Analyzes job fit using Gemini 2.5 Flash.
     Returns structured JSON with extraction and gap analysis.
     """
-    
-    prompt = f"""
-You are an expert HR Data Scientist and ATS Optimizer.
-
-STRICT RULES:
-- Respond ONLY in valid JSON.
-- Do NOT use markdown code blocks.
-- Do NOT add any text outside the JSON object.
-
-Job Description:
-{job_description}
-
-Candidate Resume:
-{resume_text}
-
-Return JSON with exactly these keys:
-- candidate_name: Full name of the candidate.
-- job_title: Current or target professional title.
-- contact_info: 
-    - email: Candidate's email address.
-    - location: Candidate's city and country/state.
-- job_fit_score: Integer (0-100) representing match percentage.
-- strengths: Array of strings (exactly 3) highlighting professional assets relevant to this JD.
-- gap_summary: Concise 2-sentence explanation of overall alignment and key missing areas.
-- matched_skills: Array of strings representing skills found in both.
-- missing_skills: Array of strings representing required skills not found in the resume.
-- recommendations: Array of actionable steps to improve fit for THIS role.
-"""
+    return await llm_cache.get_or_compute(
+        "reanalyze_resume",
+        PROMPT_VERSION,
+        {"resume_text": resume_text, "job_description": job_description},
+        lambda: _reanalyze_resume(resume_text, job_description),
+        fresh=fresh
+    )
 
-    try:
-        response = client.models.generate_content(
-            model="gemini-2.5-flash",
-            contents=prompt
-        )
+def stream_reanalyze_resume(resume_text: str, job_description: str, fresh: bool = False):
+    """
+    Streaming variant of reanalyze_resume: yields ("field", (name, value)) events
+    as the job-fit analysis is generated, then ("result", dict).
+    """
+    return llm_cache.stream_or_replay(
+        "reanalyze_resume",
+        PROMPT_VERSION,
+        {"resume_text": resume_text, "job_description": job_description},
+        lambda: _stream_job_fit(resume_text, job_description),
+        lambda: reanalyze_resume(resume_text, job_description, fresh=True),
+        fresh=fresh
+    )
 
-        if not response or not response.text:
-            return {"error": "No response text received from Gemini 2.5 Flash"}
+def _build_prompt(candidate_profile: str, job_description: str) -> str:
+    return PROMPT.render(candidate_profile=candidate_profile, job_description=job_description)
 
-        raw_text = response.text.strip()
-        if raw_text.startswith("```"):
-            raw_text = raw_text.replace("```json", "").replace("```", "").strip()
+async def _stream_job_fit(resume_text: str, job_description: str):
+    profile = await get_resume_profile(resume_text)
+    prompt = _build_prompt(render_profile(profile, JOB_FIT_FIELDS), job_description)
+    async for kind, payload in llm_gateway.stream_structured(
+        prompt, JobFitAssessmentOutput, system_instruction=PROMPT.system
+    ):
+        if kind != "result":
+            yield kind, payload
+            continue
+        for name, value in candidate_fields(profile).items():
+            yield "field", (name, value)
+        yield "result", JobFitOutput(**payload.model_dump(), **candidate_fields(profile))
 
-        return json.loads(raw_text)
+async def _reanalyze_resume(resume_text: str, job_description: str) -> dict:
+    try:
+        profile = await get_resume_profile(resume_text)
+        prompt = _build_prompt(render_profile(profile, JOB_FIT_FIELDS), job_description)
+        assessment = await llm_gateway.generate_structured(
+            prompt, JobFitAssessmentOutput, system_instruction=PROMPT.system
+        )
+        return JobFitOutput(**assessment.model_dump(), **candidate_fields(profile)).model_dump()
 
-    except Exception as e:
+    except llm_gateway.LLMOutputError as e:
         return {
             "error": "Failed to analyze job fit with Gemini 2.5 Flash",
-            "details": str(e),
-            "candidate_name": "Unknown",
-            "job_fit_score": 0,
-            "matched_skills": [],
-            "missing_skills": [],
-            "strengths": [],
-            "recommendations": ["Ensure the model 'gemini-2.5-flash' is available for this API key."]
+            "details": str(e)
         }
+
+async def reanalyze_resume_multi(resume_text: str, job_descriptions: list[str], fresh: bool = False) -> list[dict]:
+    """
+    Job fit of one resume against several job descriptions, in input order. Uncached
+    JDs are scored JOB_FIT_MULTI_CHUNK_SIZE per Gemini call, concurrently; each
+    result is cached per (resume, JD), shared with reanalyze_resume, and is either
+    a JobFitOutput dict or an {"error": ...} dict (also for a chunk whose call
+    failed with an LLMError), as from reanalyze_resume.
+    """
+    inputs = [{"resume_text": resume_text, "job_description": jd} for jd in job_descriptions]
+    results = [None] * len(job_descriptions)
+    if not fresh:
+        cached = await asyncio.gather(*(
+            llm_cache.lookup("reanalyze_resume", PROMPT_VERSION, item) for item in inputs
+        ))
+        results = list(cached)
+
+    missing = [index for index, result in enumerate(results) if result is None]
+    if not missing:
+        return results
+
+    profile = await get_resume_profile(resume_text)
+    size = max(1, settings.job_fit_multi_chunk_size)
+    chunks = [missing[start:start + size] for start in range(0, len(missing), size)]
+
+    async def score(chunk: list[int]) -> None:
+        try:
+            chunk_results = await _job_fit_chunk(resume_text, profile, [job_descriptions[index] for index in chunk])
+        except LLMError as e:
+            # e.g. the circuit opened mid-request: fail these JDs, keep the other chunks'
+            chunk_results = [{"error": str(e)}] * len(chunk)
+        # cached as each chunk finishes, so a later failure doesn't lose them
+        for index, result in zip(chunk, chunk_results):
+            results[index] = result
+            await llm_cache.store("reanalyze_resume", PROMPT_VERSION, inputs[index], result)
+
+    await asyncio.gather(*(score(chunk) for chunk in chunks))
+    return results
+
+async def _job_fit_chunk(resume_text: str, profile: dict, job_descriptions: list[str]) -> list[dict]:
+    """
+    Scores one chunk of JDs in a single call. JDs the reply leaves out or gets
+    wrong, or all of them if the reply is unusable, fall back to one call each.
+    """
+    assessments = [None] * len(job_descriptions)
+    if len(job_descriptions) > 1:
+        try:
+            items = await llm_gateway.generate_json(
+                MULTI_PROMPT.render(
+                    candidate_profile=render_profile(profile, JOB_FIT_FIELDS),
+                    items=render_batch_items(job_descriptions)
+                ),
+                list[JobFitBatchItemOutput],
+                system_instruction=MULTI_PROMPT.system
+            )
+            assessments = match_batch_results(
+                items, len(job_descriptions),
+                lambda item: JobFitAssessmentOutput.model_validate(item).model_dump()
+            )
+        except llm_gateway.LLMOutputError:
+            pass
+
+    async def single(job_description: str, assessment):
+        if assessment is None:
+            return await _reanalyze_resume(resume_text, job_description)
+        return JobFitOutput(**assessment, **candidate_fields(profile)).model_dump()
+
+    return await asyncio.gather(*(
+        single(job_description, assessment) for job_description, assessment in zip(job_descriptions, assessments)
+    ))
@@ -0,0 +1,171 @@
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+
+from app import metrics
+from app.config import settings
+from app.services.admission import AdmissionRejected
+from app.services.llm_errors import LLMError
+
+
+class JobQueueFull(Exception):
+    """
+    Raised by submit() when the pending-job queue is at capacity.
+    """
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Job queue is full; retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+def describe_error(exc: Exception) -> tuple[dict, bool]:
+    """
+    Maps a job handler's exception to the error recorded on the job, and whether
+    another attempt could succeed (upstream and server errors and rejected
+    admission, not bad input). Status codes match the synchronous endpoints.
+    """
+    if isinstance(exc, HTTPException):
+        return {"status_code": exc.status_code, "detail": exc.detail}, exc.status_code >= 500
+    if isinstance(exc, AdmissionRejected):
+        return {"status_code": 429, "detail": str(exc), "retry_after": exc.retry_after}, True
+    if isinstance(exc, LLMError):
+        return {"status_code": 503, "detail": str(exc), "retry_after": exc.retry_after}, True
+    if isinstance(exc, ValidationError):
+        return {"status_code": 422, "detail": exc.errors(include_url=False)}, False
+    return {"status_code": 500, "detail": str(exc)}, True
+
+
+class Job:
+    def __init__(self, kind: str, request, fresh: bool):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.request = request
+        self.fresh = fresh
+        self.status = "queued"
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.finished = asyncio.Event()
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "result": self.result,
+            "error": self.error
+        }
+
+
+class JobManager:
+    """
+    Runs submitted analyses on a fixed pool of worker tasks so the HTTP request
+    that created them can return immediately. Handlers are the same coroutines
+    the synchronous endpoints await, so results are persisted exactly as before;
+    the job record itself only lives in memory for `retention` seconds.
+    """
+
+    def __init__(self, workers: int, max_pending: int, retention: float):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.retention = retention
+        self.handlers = {}
+        # kinds only the app itself may queue, never POST /jobs/{kind}
+        self.internal = set()
+        self.jobs: OrderedDict[str, Job] = OrderedDict()
+        self.running = 0
+        self._queue = None
+        self._tasks = []
+        # moving average of job run time, used for Retry-After when full
+        self.avg_run_time = 5.0
+
+    def register(self, kind: str, request_model, handler, internal: bool = False) -> None:
+        self.handlers[kind] = (request_model, handler)
+        if internal:
+            self.internal.add(kind)
+
+    def start(self) -> None:
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(self, kind: str, request, fresh: bool = False) -> Job:
+        self._prune()
+        job = Job(kind, request, fresh)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            metrics.incr("jobs.rejected")
+            backlog = self._queue.qsize() + self.running
+            raise JobQueueFull(max(1, int(backlog / self.workers * self.avg_run_time)))
+        self.jobs[job.id] = job
+        metrics.incr(f"jobs.{kind}.submitted")
+        metrics.set_gauge("jobs.queued", self._queue.qsize())
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        return self.jobs.get(job_id)
+
+    def _prune(self) -> None:
+        # jobs finish out of submission order, so a long-running job must not
+        # shield the expired ones queued after it
+        cutoff = time.time() - self.retention
+        expired = [
+            job_id for job_id, job in self.jobs.items()
+            if job.finished_at is not None and job.finished_at <= cutoff
+        ]
+        for job_id in expired:
+            del self.jobs[job_id]
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job) -> None:
+        _, handler = self.handlers[job.kind]
+        job.status = "running"
+        job.started_at = time.time()
+        self.running += 1
+        metrics.set_gauge("jobs.queued", self._queue.qsize())
+        metrics.set_gauge("jobs.running", self.running)
+        metrics.incr("jobs.wait_seconds", job.started_at - job.created_at)
+        try:
+            job.result = await handler(job.request, job.fresh)
+            job.status = "succeeded"
+        except Exception as e:
+            job.status = "failed"
+            job.error, _ = describe_error(e)
+        finally:
+            job.finished_at = time.time()
+            run_time = job.finished_at - job.started_at
+            self.avg_run_time = 0.9 * self.avg_run_time + 0.1 * run_time
+            self.running -= 1
+            metrics.set_gauge("jobs.running", self.running)
+            metrics.incr("jobs.run_seconds", run_time)
+            metrics.incr(f"jobs.{job.kind}.{job.status}")
+            job.finished.set()
+
+
+job_manager = JobManager(
+    workers=settings.job_workers,
+    max_pending=settings.job_max_pending,
+    retention=settings.job_retention
+)
@@ -0,0 +1,251 @@
+import json
+
+_WHITESPACE = " \t\n\r"
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+class IncrementalJSONParser:
+    """
+    Tolerant incremental parser for streamed LLM JSON output.
+
+    Feed it text chunks as they arrive; each call returns the events that became
+    complete in that chunk:
+
+    - ("field", (key, value)) for each top-level key of a root object
+    - ("item", (key, index, value)) for each element of a root array (key None)
+      or of an array that is the value of a top-level key (e.g. each MCQ in "mcqs")
+
+    Every character is scanned exactly once and every emitted value is decoded
+    once, so a whole stream is parsed in linear time. Text before the root value
+    and after it closes (markdown fences, stray prose) is ignored.
+
+    Scanned text is dropped as soon as no pending value needs it, so memory stays
+    bounded on long streams; pass keep_text=True to also keep the raw text.
+    """
+
+    def __init__(self, keep_text: bool = False):
+        self._chunks: list[str] | None = [] if keep_text else None
+        self.chars = 0              # characters fed so far
+        self._buf = ""
+        self._base = 0              # absolute offset of self._buf[0]
+        self._pos = 0               # next index in self._buf to scan
+        self._stack: list[str] = []
+        self._in_string = False
+        self._escape = False
+        self._state = "value"       # root-object position: key / colon / value / in_value
+        self._key = None
+        self._key_start = None
+        self._value_start = None
+        self._array_items = None    # items of the top-level array value being read
+        self._tracked_depth = None  # depth of the array whose items are emitted
+        self._item_start = None
+        self._item_index = 0
+        self._root = None
+        self._invalid = False
+        self.done = False
+
+    @property
+    def text(self) -> str:
+        if self._chunks is None:
+            raise ValueError("raw text is only kept with keep_text=True")
+        return "".join(self._chunks)
+
+    def value(self):
+        """
+        The root JSON value, assembled from the emitted fields/items. Raises
+        ValueError if the stream ended before it closed or part of it was invalid.
+        """
+        if not self.done or self._invalid:
+            raise ValueError("incomplete or invalid JSON document")
+        return self._root
+
+    def _decode(self, start: int, end: int):
+        try:
+            return True, json.loads(self._buf[start:end])
+        except json.JSONDecodeError:
+            self._invalid = True
+            return False, None
+
+    def _emit_item(self, end: int, events: list) -> None:
+        if self._item_start is None:
+            return
+        ok, value = self._decode(self._item_start, end)
+        if ok:
+            key = self._key if self._stack[0] == "{" else None
+            events.append(("item", (key, self._item_index, value)))
+            if self._array_items is not None:
+                self._array_items.append(value)
+        self._item_index += 1
+        self._item_start = None
+
+    def feed(self, chunk: str) -> list:
+        self.chars += len(chunk)
+        if self._chunks is not None:
+            self._chunks.append(chunk)
+        if self.done:
+            return []
+
+        events = []
+        self._buf += chunk
+        buf = self._buf
+        i = self._pos
+        n = len(buf)
+        stack = self._stack
+
+        while i < n:
+            c = buf[i]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    if self._key_start is not None:
+                        self._key = json.loads(buf[self._key_start:i + 1])
+                        self._key_start = None
+                        self._state = "colon"
+                i += 1
+                continue
+
+            if not stack:
+                if c in _CLOSERS:
+                    stack.append(c)
+                    self._root = {} if c == "{" else []
+                    self._state = "key" if c == "{" else "value"
+                    if c == "[":
+                        self._tracked_depth = 1
+                i += 1
+                continue
+
+            if c in _WHITESPACE:
+                i += 1
+                continue
+
+            depth = len(stack)
+
+            if depth == 1 and stack[0] == "{":
+                if c == "," or c == "}":
+                    if self._array_items is not None:
+                        events.append(("field", (self._key, self._array_items)))
+                        self._array_items = None
+                    elif self._value_start is not None:
+                        ok, value = self._decode(self._value_start, i)
+                        if ok:
+                            events.append(("field", (self._key, value)))
+                        self._value_start = None
+                    self._state = "key"
+                    if c == "}":
+                        stack.pop()
+                        self.done = True
+                        i += 1
+                        break
+                    i += 1
+                    continue
+                if self._state == "key":
+                    if c == '"':
+                        self._key_start = i
+                        self._in_string = True
+                    i += 1
+                    continue
+                if self._state == "colon":
+                    if c == ":":
+                        self._state = "value"
+                    i += 1
+                    continue
+                if self._state == "value":
+                    # arrays are assembled from their items, so their text need not be kept
+                    self._state = "in_value"
+                    if c == "[":
+                        self._array_items = []
+                        self._tracked_depth = 2
+                        self._item_index = 0
+                    else:
+                        self._value_start = i
+
+            if depth == self._tracked_depth:
+                if c == ",":
+                    self._emit_item(i, events)
+                    i += 1
+                    continue
+                if c == "]":
+                    self._emit_item(i, events)
+                    self._tracked_depth = None
+                elif self._item_start is None:
+                    self._item_start = i
+
+            if c == '"':
+                self._in_string = True
+            elif c in _CLOSERS:
+                stack.append(c)
+            elif c == "}" or c == "]":
+                stack.pop()
+                if not stack:
+                    self.done = True
+                    i += 1
+                    break
+            i += 1
+
+        self._trim(i)
+        for kind, payload in events:
+            if kind == "field":
+                self._root[payload[0]] = payload[1]
+            elif payload[0] is None:
+                self._root.append(payload[2])
+        return events
+
+    def _trim(self, pos: int) -> None:
+        # Drop text that no pending value can still need, keeping the buffer small.
+        keep = pos
+        for start in (self._key_start, self._value_start, self._item_start):
+            if start is not None and start < keep:
+                keep = start
+        if keep:
+            self._buf = self._buf[keep:]
+            self._base += keep
+            for name in ("_key_start", "_value_start", "_item_start"):
+                start = getattr(self, name)
+                if start is not None:
+                    setattr(self, name, start - keep)
+        self._pos = pos - keep
+
+
+def _benchmark(size_kb: int = 16, chunk_size: int = 64, rounds: int = 20) -> None:
+    import time
+
+    mcqs = []
+    while len(json.dumps({"mcqs": mcqs})) < size_kb * 1024:
+        n = len(mcqs)
+        mcqs.append({
+            "question": f"Question {n}: which statement about \"topic {n}\" is correct?",
+            "options": [f"Option {n}-{k} with some explanatory text" for k in range(4)],
+            "answer": f"Option {n}-2 with some explanatory text",
+        })
+    text = "```json\n" + json.dumps({"mcqs": mcqs}, indent=2) + "\n```"
+    chunks = [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)]
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        parser = IncrementalJSONParser()
+        items = sum(len(parser.feed(chunk)) for chunk in chunks)
+    incremental = (time.perf_counter() - start) / rounds
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        buffer = ""
+        for chunk in chunks:
+            buffer += chunk
+            try:
+                json.loads(buffer.strip("`").removeprefix("json"))
+            except json.JSONDecodeError:
+                pass
+    reparse = (time.perf_counter() - start) / rounds
+
+    print(f"{len(text) / 1024:.1f} KB in {len(chunks)} chunks, {items} events")
+    print(f"incremental parser: {incremental * 1000:.2f} ms per stream")
+    print(f"re-parse per chunk: {reparse * 1000:.2f} ms per stream")
+
+
+if __name__ == "__main__":
+    _benchmark()
@@ -0,0 +1,248 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from app import metrics
+from app.config import settings
+from app.database import SessionLocal, run_db
+from app.models import LLMCacheEntry
+from app.services import llm_gateway
+from app.services.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize(value):
+    if isinstance(value, str):
+        return " ".join(value.split())
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def make_key(task: str, model: str, prompt_version: str, inputs: dict) -> str:
+    """
+    Content address of an LLM result: sha256 over task, model, prompt version
+    and whitespace-normalized inputs.
+    """
+    payload = json.dumps(
+        [task, model, prompt_version, _normalize(inputs)],
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def is_cacheable(result) -> bool:
+    if isinstance(result, dict):
+        return "error" not in result
+    if isinstance(result, list):
+        return not (result and isinstance(result[0], dict) and "error" in result[0])
+    return result is not None
+
+
+class TTLCache:
+    """
+    Thread-safe in-process LRU with a per-entry time-to-live.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data: OrderedDict[str, tuple[float, object]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+memory_cache = TTLCache(settings.llm_cache_max_entries, settings.llm_cache_ttl)
+inflight = SingleFlight("llm")
+_purge_lock = threading.Lock()
+_next_purge = 0.0
+
+
+def _db_get(key: str):
+    db = SessionLocal()
+    try:
+        entry = db.query(LLMCacheEntry).filter(LLMCacheEntry.key == key).first()
+        if entry is None or entry.expires_at < datetime.utcnow():
+            return None
+        return entry.result
+    finally:
+        db.close()
+
+
+def purge_expired(db) -> int:
+    """
+    Deletes expired llm_cache rows; returns how many.
+    """
+    deleted = db.query(LLMCacheEntry).filter(LLMCacheEntry.expires_at < datetime.utcnow()).delete(
+        synchronize_session=False
+    )
+    db.commit()
+    metrics.incr("llm_cache.db.purged", deleted)
+    return deleted
+
+
+def _purge_due() -> bool:
+    global _next_purge
+    with _purge_lock:
+        now = time.monotonic()
+        if now < _next_purge:
+            return False
+        _next_purge = now + settings.llm_cache_db_purge_interval
+        return True
+
+
+def _db_set(key: str, task: str, prompt_version: str, result) -> None:
+    db = SessionLocal()
+    try:
+        db.merge(LLMCacheEntry(
+            key=key,
+            task=task,
+            model=settings.gemini_model,
+            prompt_version=prompt_version,
+            result=result,
+            created_at=datetime.utcnow(),
+            expires_at=datetime.utcnow() + timedelta(seconds=settings.llm_cache_db_ttl),
+        ))
+        db.commit()
+    except Exception:
+        db.rollback()
+        logger.warning("Failed to persist LLM cache entry %s", key, exc_info=True)
+        db.close()
+        return
+
+    try:
+        if _purge_due():
+            purge_expired(db)
+    except Exception:
+        db.rollback()
+        logger.warning("Failed to purge expired LLM cache entries", exc_info=True)
+    finally:
+        db.close()
+
+
+async def _lookup_key(task: str, key: str):
+    result = memory_cache.get(key)
+    if result is not None:
+        metrics.incr(f"llm_cache.{task}.memory_hit")
+        return result
+    if settings.llm_cache_db_enabled:
+        result = await run_db(_db_get, key)
+        if result is not None:
+            metrics.incr(f"llm_cache.{task}.db_hit")
+            memory_cache.set(key, result)
+            return result
+    metrics.incr(f"llm_cache.{task}.miss")
+    return None
+
+
+async def _store_key(task: str, prompt_version: str, key: str, result) -> None:
+    if not is_cacheable(result):
+        return
+    memory_cache.set(key, result)
+    if settings.llm_cache_db_enabled:
+        await run_db(_db_set, key, task, prompt_version, result)
+
+
+async def lookup(task: str, prompt_version: str, inputs: dict):
+    """
+    Returns the cached result for (task, model, prompt_version, inputs), or None.
+    """
+    key = make_key(task, settings.gemini_model, prompt_version, inputs)
+    return await _lookup_key(task, key)
+
+
+async def store(task: str, prompt_version: str, inputs: dict, result) -> None:
+    key = make_key(task, settings.gemini_model, prompt_version, inputs)
+    await _store_key(task, prompt_version, key, result)
+
+
+async def get_or_compute(task: str, prompt_version: str, inputs: dict, compute, fresh: bool = False):
+    """
+    Returns the cached result for (task, model, prompt_version, inputs), or awaits
+    `compute()` and stores its result in both tiers. `fresh=True` skips the lookup
+    but still refreshes the cache with the new result. Concurrent misses for the
+    same key share a single `compute()` call.
+    """
+    key = make_key(task, settings.gemini_model, prompt_version, inputs)
+
+    if fresh:
+        metrics.incr(f"llm_cache.{task}.bypass")
+    else:
+        result = await _lookup_key(task, key)
+        if result is not None:
+            return result
+
+    async def compute_and_store():
+        result = await compute()
+        await _store_key(task, prompt_version, key, result)
+        return result
+
+    # fresh calls coalesce among themselves but never join a cached-path flight
+    flight_key = f"fresh:{key}" if fresh else key
+    return await inflight.do(flight_key, compute_and_store)
+
+
+async def stream_or_replay(task: str, prompt_version: str, inputs: dict, stream, fallback, fresh: bool = False):
+    """
+    Async generator over ("field", (name, value)) / ("item", (name, index, value))
+    events and a final ("result", dict) event.
+
+    A cached result is replayed field by field. Otherwise the events of `stream()`
+    (see llm_gateway.stream_structured) are relayed and the final result is cached.
+    If the stream ends in invalid output, `fallback()` (the non-streaming task,
+    with its bounded retry) supplies the result instead.
+    """
+    if fresh:
+        metrics.incr(f"llm_cache.{task}.bypass")
+    else:
+        cached = await lookup(task, prompt_version, inputs)
+        if cached is not None:
+            for name, value in cached.items():
+                yield "field", (name, value)
+            yield "result", cached
+            return
+
+    try:
+        async for kind, payload in stream():
+            if kind == "result":
+                result = payload.model_dump()
+            else:
+                yield kind, payload
+    except llm_gateway.LLMOutputError:
+        result = await fallback()
+    else:
+        await store(task, prompt_version, inputs, result)
+    yield "result", result
@@ -0,0 +1,32 @@
+class LLMError(Exception):
+    """
+    Base class for failures of the LLM path that callers may want to handle.
+    """
+
+    retry_after: int | None = None
+
+
+class LLMOutputError(LLMError):
+    """
+    Raised when Gemini keeps returning output that does not match the task schema.
+    """
+
+    def __init__(self, message: str, raw_text: str | None = None):
+        super().__init__(message)
+        self.raw_text = raw_text
+
+
+class LLMUnavailableError(LLMError):
+    """
+    Raised when Gemini could not be reached after retries. Mapped to HTTP 503.
+    """
+
+    def __init__(self, message: str, retry_after: int | None = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(LLMUnavailableError):
+    """
+    Raised without calling Gemini while the circuit breaker is open.
+    """
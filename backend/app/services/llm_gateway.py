@@ -0,0 +1,390 @@
+import asyncio
+import json
+from functools import lru_cache
+
+import httpx
+from google import genai
+from google.genai import errors as genai_errors
+from google.genai import types
+from pydantic import TypeAdapter, ValidationError
+
+from app import metrics
+from app.config import settings
+from app.services.admission import llm_admission
+from app.services.context_cache import context_cache
+from app.services.json_stream import IncrementalJSONParser
+from app.services.llm_errors import LLMOutputError, LLMUnavailableError
+from app.services.resilience import backoff_delay, is_transient, llm_breaker, llm_retry_budget
+
+_client: genai.Client | None = None
+_http_client: httpx.AsyncClient | None = None
+
+
+def get_client() -> genai.Client:
+    """
+    Returns the process-wide Gemini client, creating it on first use.
+    All services share its async HTTP connection pool.
+    """
+    global _client, _http_client
+    if _client is None:
+        api_key = settings.gemini_api_key
+        if not api_key and settings.gemini_base_url:
+            api_key = "fake-gemini-key"
+        if not api_key:
+            raise ValueError("GEMINI_API_KEY not found in .env")
+
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.llm_max_connections,
+                max_keepalive_connections=settings.llm_max_keepalive,
+                keepalive_expiry=settings.llm_keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(settings.llm_timeout, connect=settings.llm_connect_timeout),
+        )
+        _client = genai.Client(
+            api_key=api_key,
+            http_options=types.HttpOptions(
+                base_url=settings.gemini_base_url,
+                timeout=int(settings.llm_timeout * 1000),
+                httpx_async_client=_http_client,
+            ),
+        )
+    return _client
+
+
+def _build_config(config: dict | None, timeout: float | None) -> dict | None:
+    merged = dict(config or {})
+    if timeout is not None:
+        merged["http_options"] = types.HttpOptions(timeout=int(timeout * 1000))
+    return merged or None
+
+
+def _record_usage(usage) -> None:
+    # prompt_token_count includes the tokens served from a cached-content handle
+    if usage is None:
+        return
+    cached = usage.cached_content_token_count or 0
+    metrics.incr("llm.tokens.input_cached", cached)
+    metrics.incr("llm.tokens.input_inline", (usage.prompt_token_count or 0) - cached)
+    metrics.incr("llm.tokens.output", usage.candidates_token_count or 0)
+
+
+def _unavailable(exc: Exception) -> LLMUnavailableError:
+    retry_after = llm_breaker.retry_after() if llm_breaker.is_open() else None
+    return LLMUnavailableError(f"Gemini request failed: {exc}", retry_after)
+
+
+def _should_retry(exc: Exception, attempt: int) -> bool:
+    """
+    Records a failed upstream attempt with the circuit breaker and decides whether
+    it may be retried (transient error, attempts left, circuit closed, budget left).
+    """
+    if not is_transient(exc):
+        llm_breaker.release()
+        return False
+    llm_breaker.record_failure()
+    metrics.incr("llm.upstream_errors")
+    if attempt + 1 >= settings.llm_retry_attempts or llm_breaker.is_open():
+        return False
+    if not llm_retry_budget.try_spend():
+        return False
+    metrics.incr("llm.retries")
+    return True
+
+
+async def generate_content(
+    prompt,
+    config: dict | None = None,
+    model: str | None = None,
+    timeout: float | None = None,
+) -> types.GenerateContentResponse:
+    """
+    Sends a single generate_content call through the shared async client, behind
+    the circuit breaker and admission control. Transient failures are retried with
+    jittered backoff within the retry budget, then raised as LLMUnavailableError.
+    `timeout` overrides the default per-call timeout (seconds).
+    """
+    client = get_client()
+    llm_retry_budget.record_attempt()
+    attempt = 0
+    while True:
+        llm_breaker.before_call()
+        try:
+            async with llm_admission.slot():
+                response = await client.aio.models.generate_content(
+                    model=model or settings.gemini_model,
+                    contents=prompt,
+                    config=_build_config(config, timeout),
+                )
+        except asyncio.CancelledError:
+            llm_breaker.release()
+            raise
+        except Exception as e:
+            if not _should_retry(e, attempt):
+                if is_transient(e):
+                    raise _unavailable(e) from e
+                raise
+            await asyncio.sleep(backoff_delay(attempt))
+            attempt += 1
+            continue
+
+        llm_breaker.record_success()
+        _record_usage(response.usage_metadata)
+        return response
+
+
+async def stream_content(
+    prompt,
+    config: dict | None = None,
+    model: str | None = None,
+    timeout: float | None = None,
+):
+    """
+    Streams a generate_content call, yielding text chunks as they arrive. Opening
+    the stream is retried like generate_content; a failure after the first chunk
+    has been yielded is not retried.
+    """
+    client = get_client()
+    llm_retry_budget.record_attempt()
+    attempt = 0
+    while True:
+        llm_breaker.before_call()
+        error = None
+        async with llm_admission.slot():
+            try:
+                stream = await client.aio.models.generate_content_stream(
+                    model=model or settings.gemini_model,
+                    contents=prompt,
+                    config=_build_config(config, timeout),
+                )
+                chunk = await anext(stream, None)
+            except asyncio.CancelledError:
+                llm_breaker.release()
+                raise
+            except Exception as e:
+                error = e
+
+            if error is None:
+                usage = None
+                try:
+                    while chunk is not None:
+                        usage = chunk.usage_metadata or usage
+                        if chunk.text:
+                            yield chunk.text
+                        chunk = await anext(stream, None)
+                except Exception as e:
+                    if is_transient(e):
+                        llm_breaker.record_failure()
+                        raise _unavailable(e) from e
+                    llm_breaker.release()
+                    raise
+                except BaseException:
+                    llm_breaker.release()
+                    raise
+                llm_breaker.record_success()
+                _record_usage(usage)
+                return
+
+        if not _should_retry(error, attempt):
+            if is_transient(error):
+                raise _unavailable(error) from error
+            raise error
+        await asyncio.sleep(backoff_delay(attempt))
+        attempt += 1
+
+
+@lru_cache(maxsize=None)
+def _adapter(schema) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+
+def _format_errors(error: ValidationError, limit: int = 10) -> str:
+    lines = []
+    for item in error.errors()[:limit]:
+        location = ".".join(str(part) for part in item["loc"]) or "<root>"
+        lines.append(f"- {location}: {item['msg']}")
+    return "\n".join(lines)
+
+
+def _first_turn(prompt: str, context: str | None, handle: str | None, system: str | None) -> types.Content:
+    if handle:
+        # a request using cached content may not set a system instruction
+        text = f"{system}\n\n{prompt}" if system else prompt
+    else:
+        text = prompt if context is None else f"{context}\n\n{prompt}"
+    return types.Content(role="user", parts=[types.Part(text=text)])
+
+
+def _call_config(config: dict, handle: str | None, system: str | None) -> dict:
+    if handle:
+        return {**config, "cached_content": handle}
+    if system:
+        return {**config, "system_instruction": system}
+    return config
+
+
+def _handle_rejected(exc: genai_errors.ClientError, handle: str | None) -> bool:
+    # an expired or evicted cached-content handle comes back as 403 or 404; any
+    # other 4xx (e.g. 400 INVALID_ARGUMENT) would fail inline just the same
+    return handle is not None and exc.code in (403, 404)
+
+
+async def _context_handle(context: str | None) -> str | None:
+    if context is None:
+        return None
+    return await context_cache.get(get_client(), settings.gemini_model, context)
+
+
+async def generate_structured(
+    prompt: str,
+    schema,
+    config: dict | None = None,
+    timeout: float | None = None,
+    max_attempts: int | None = None,
+    context: str | None = None,
+    system_instruction: str | None = None,
+):
+    """
+    Calls Gemini with `schema` as the response schema (JSON mime type) and validates
+    the reply against it in a single pass. Invalid replies get a bounded retry that
+    feeds the validation errors back to the model. Returns the validated object.
+
+    `system_instruction` carries a prompt template's static instructions.
+    `context` is a large document shared with other calls (the resume). It is sent
+    as a cached-content handle when one is available and prepended to the prompt
+    otherwise.
+    """
+    adapter = _adapter(schema)
+    merged = {
+        **(config or {}),
+        "response_mime_type": "application/json",
+        "response_schema": schema,
+    }
+    handle = await _context_handle(context)
+    history = []
+    attempts = max_attempts or settings.llm_structured_attempts
+
+    raw_text = None
+    for attempt in range(attempts):
+        try:
+            response = await generate_content(
+                [_first_turn(prompt, context, handle, system_instruction), *history],
+                config=_call_config(merged, handle, system_instruction),
+                timeout=timeout,
+            )
+        except genai_errors.ClientError as e:
+            if not _handle_rejected(e, handle):
+                raise
+            # the handle expired or was evicted before our TTL said so; go inline
+            context_cache.invalidate(context)
+            handle = None
+            response = await generate_content(
+                [_first_turn(prompt, context, None, system_instruction), *history],
+                config=_call_config(merged, None, system_instruction),
+                timeout=timeout,
+            )
+        raw_text = response.text or ""
+        try:
+            return adapter.validate_json(raw_text)
+        except ValidationError as e:
+            metrics.incr("llm.structured.invalid")
+            history = history + [
+                types.Content(role="model", parts=[types.Part(text=raw_text)]),
+                types.Content(role="user", parts=[types.Part(text=(
+                    "Your previous reply did not match the required JSON schema:\n"
+                    f"{_format_errors(e)}\n"
+                    "Reply again with the corrected JSON only."
+                ))]),
+            ]
+
+    metrics.incr("llm.structured.failed")
+    raise LLMOutputError(f"Gemini returned invalid JSON after {attempts} attempts", raw_text)
+
+
+async def generate_json(
+    prompt: str,
+    schema,
+    config: dict | None = None,
+    timeout: float | None = None,
+    system_instruction: str | None = None,
+):
+    """
+    Like generate_structured, but returns the parsed JSON without validating it:
+    `schema` still constrains generation, and the caller validates the parts it
+    needs (e.g. each item of a batched reply). Raises LLMOutputError if the reply
+    is not JSON.
+    """
+    merged = {
+        **(config or {}),
+        "response_mime_type": "application/json",
+        "response_schema": schema,
+    }
+    response = await generate_content(
+        [_first_turn(prompt, None, None, system_instruction)],
+        config=_call_config(merged, None, system_instruction),
+        timeout=timeout,
+    )
+    try:
+        return json.loads(response.text or "")
+    except json.JSONDecodeError:
+        metrics.incr("llm.structured.invalid")
+        raise LLMOutputError("Gemini returned invalid JSON", response.text)
+
+
+async def stream_structured(
+    prompt: str,
+    schema,
+    config: dict | None = None,
+    timeout: float | None = None,
+    context: str | None = None,
+    system_instruction: str | None = None,
+):
+    """
+    Streaming counterpart of generate_structured. Yields ("field", (name, value))
+    for each top-level key and ("item", (name, index, value)) for each array element
+    as soon as it closes (see IncrementalJSONParser), then ("result", validated_object).
+    Raises LLMOutputError if the final document is invalid.
+    """
+    merged = {
+        **(config or {}),
+        "response_mime_type": "application/json",
+        "response_schema": schema,
+    }
+    handle = await _context_handle(context)
+    parser = IncrementalJSONParser()
+    try:
+        async for text in stream_content([_first_turn(prompt, context, handle, system_instruction)],
+                                         config=_call_config(merged, handle, system_instruction),
+                                         timeout=timeout):
+            for event in parser.feed(text):
+                yield event
+    except genai_errors.ClientError as e:
+        # an expired handle is rejected when the stream opens, before any output
+        if not _handle_rejected(e, handle) or parser.chars:
+            raise
+        context_cache.invalidate(context)
+        async for text in stream_content([_first_turn(prompt, context, None, system_instruction)],
+                                         config=_call_config(merged, None, system_instruction),
+                                         timeout=timeout):
+            for event in parser.feed(text):
+                yield event
+
+    try:
+        result = _adapter(schema).validate_python(parser.value())
+    except (ValueError, ValidationError):
+        metrics.incr("llm.structured.invalid")
+        raise LLMOutputError("Gemini streamed invalid JSON")
+    yield "result", result
+
+
+async def aclose() -> None:
+    """
+    Closes the shared client and its connection pool (called on app shutdown).
+    """
+    global _client, _http_client
+    if _client is not None:
+        await _client.aio.aclose()
+        _client = None
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
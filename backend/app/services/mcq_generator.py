@@ -1,54 +1,57 @@
-import os
-import json
-from dotenv import load_dotenv
-from google import genai
+from app.config import settings
+from app.schemas import MCQBatchItemOutput, MCQSetOutput
+from app.services import llm_cache, llm_gateway, prompts
+from app.services.batcher import MicroBatcher, match_batch_results, render_batch_items
+from app.services.resume_profile import MCQ_FIELDS, get_resume_profile, render_profile
 
-load_dotenv()
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+PROMPT = prompts.get("mcqs")
+BATCH_PROMPT = prompts.get("mcqs_batch")
+PROMPT_VERSION = prompts.cache_version("mcqs", "mcqs_batch", "resume_profile")
 
-if not GEMINI_API_KEY:
-    raise ValueError("GEMINI_API_KEY not found in .env")
-
-client = genai.Client(api_key=GEMINI_API_KEY)
-
-def generate_mcqs_from_resume(resume_text: str) -> dict:
+async def generate_mcqs_from_resume(resume_text: str, fresh: bool = False) -> dict:
     """
     Generates 10 skill-based MCQs from a candidate's resume using Gemini 2.5 Flash.
     Returns a dictionary containing the list of MCQs or an error message.
     """
-    
-    prompt = f"""
-You are a Senior Technical Interviewer. Your task is to validate a candidate's technical expertise through a skill-based assessment.
-
-STRICT GUIDELINES:
-1. Do NOT ask questions about the candidate's personal history, internship locations, or specific company names.
-2. Identify core technical skills from the resume (e.g., IoT, Python, C Programming, Embedded Systems, Electronics).
-3. Generate 10 high-quality, conceptual, or practical MCQs testing deep understanding of those skills.
-4. Ensure questions range from basic to intermediate difficulty.
-5. The "answer" must be the exact text of the correct option from the "options" list.
-
-Candidate Resume Text:
-{resume_text}
-
-Return ONLY a JSON object with this structure:
-{{
-    "mcqs": [
-        {{
-            "question": "A technical question",
-            "options": ["Option A", "Option B", "Option C", "Option D"],
-            "answer": "Option B"
-        }}
-    ]
-}}
-"""
-
+    return await llm_cache.get_or_compute(
+        "generate_mcqs_from_resume",
+        PROMPT_VERSION,
+        {"resume_text": resume_text},
+        lambda: _generate_mcqs_from_resume(resume_text),
+        fresh=fresh
+    )
+
+def _build_prompt(candidate_profile: str) -> str:
+    return PROMPT.render(candidate_profile=candidate_profile)
+
+async def _generate_single(candidate_profile: str) -> dict:
+    result = await llm_gateway.generate_structured(
+        _build_prompt(candidate_profile), MCQSetOutput, system_instruction=PROMPT.system
+    )
+    return result.model_dump()
+
+async def _generate_batch(candidate_profiles: list[str]) -> list:
+    items = await llm_gateway.generate_json(
+        BATCH_PROMPT.render(items=render_batch_items(candidate_profiles)),
+        list[MCQBatchItemOutput],
+        system_instruction=BATCH_PROMPT.system
+    )
+    return match_batch_results(
+        items, len(candidate_profiles),
+        lambda item: MCQSetOutput.model_validate({"mcqs": item["mcqs"]}).model_dump()
+    )
+
+mcq_batcher = MicroBatcher(
+    "mcqs", _generate_batch, _generate_single,
+    window=settings.llm_batch_window,
+    max_size=settings.llm_batch_max_size,
+    enabled=settings.llm_batching_enabled
+)
+
+async def _generate_mcqs_from_resume(resume_text: str) -> dict:
     try:
-        response = client.models.generate_content(
-            model="gemini-2.5-flash",
-            contents=prompt,
-            config={"response_mime_type": "application/json"}
-        )
-        return json.loads(response.text.strip())
+        profile = await get_resume_profile(resume_text)
+        return await mcq_batcher.submit(render_profile(profile, MCQ_FIELDS))
     
-    except Exception as e:
+    except llm_gateway.LLMOutputError as e:
         return {"error": str(e), "mcqs": []}
@@ -0,0 +1,142 @@
+import asyncio
+import math
+import random
+import threading
+import time
+
+import httpx
+from google.genai import errors as genai_errors
+
+from app import metrics
+from app.config import settings
+from app.services.llm_errors import CircuitOpenError
+
+TRANSIENT_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+def is_transient(exc: BaseException) -> bool:
+    """
+    True for upstream failures worth retrying: timeouts, connection errors,
+    rate limiting and 5xx responses. Bad requests and auth errors are not.
+    """
+    if isinstance(exc, genai_errors.APIError):
+        return exc.code in TRANSIENT_STATUS_CODES
+    return isinstance(exc, (httpx.TimeoutException, httpx.TransportError, asyncio.TimeoutError))
+
+
+def backoff_delay(attempt: int) -> float:
+    """
+    Full-jitter exponential backoff for the given retry number (0-based).
+    """
+    ceiling = min(settings.llm_retry_max_delay, settings.llm_retry_base_delay * (2 ** attempt))
+    return random.uniform(0, ceiling)
+
+
+class RetryBudget:
+    """
+    Per-process token bucket that caps retries to a fraction of first attempts,
+    so retries cannot multiply load on an upstream that is already failing.
+    """
+
+    def __init__(self, name: str, ratio: float, max_tokens: float):
+        self.name = name
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+        self._lock = threading.Lock()
+
+    def record_attempt(self) -> None:
+        with self._lock:
+            self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+            metrics.set_gauge(f"{self.name}.tokens", round(self.tokens, 2))
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self.tokens < 1:
+                metrics.incr(f"{self.name}.exhausted")
+                return False
+            self.tokens -= 1
+            metrics.set_gauge(f"{self.name}.tokens", round(self.tokens, 2))
+            return True
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive upstream failures and then fails
+    calls immediately for `reset_timeout` seconds. After that a single probe call
+    is let through (half-open); its outcome closes or re-opens the circuit.
+    """
+
+    CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+    _STATE_GAUGE = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        self._set_state(self.CLOSED)
+
+    def _set_state(self, state: str) -> None:
+        self.state = state
+        metrics.set_gauge(f"{self.name}.state", self._STATE_GAUGE[state])
+
+    def retry_after(self) -> int:
+        remaining = self.reset_timeout - (time.monotonic() - self.opened_at)
+        return max(1, math.ceil(remaining))
+
+    def before_call(self) -> None:
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    metrics.incr(f"{self.name}.short_circuited")
+                    raise CircuitOpenError("Gemini circuit is open", self.retry_after())
+                self._set_state(self.HALF_OPEN)
+            if self.state == self.HALF_OPEN:
+                if self._probe_in_flight:
+                    metrics.incr(f"{self.name}.short_circuited")
+                    raise CircuitOpenError("Gemini circuit is half-open, probe in flight", 1)
+                self._probe_in_flight = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._probe_in_flight = False
+            if self.state != self.CLOSED:
+                self._set_state(self.CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._probe_in_flight = False
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    metrics.incr(f"{self.name}.opened")
+                self.opened_at = time.monotonic()
+                self._set_state(self.OPEN)
+
+    def release(self) -> None:
+        """
+        Ends a call that neither succeeded nor failed upstream (e.g. cancelled).
+        """
+        with self._lock:
+            self._probe_in_flight = False
+
+    def is_open(self) -> bool:
+        return self.state == self.OPEN and time.monotonic() - self.opened_at < self.reset_timeout
+
+
+llm_retry_budget = RetryBudget(
+    "llm.retry_budget",
+    ratio=settings.llm_retry_budget_ratio,
+    max_tokens=settings.llm_retry_budget_max,
+)
+llm_breaker = CircuitBreaker(
+    "llm.circuit",
+    failure_threshold=settings.llm_breaker_failures,
+    reset_timeout=settings.llm_breaker_reset_timeout,
+)
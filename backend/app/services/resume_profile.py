@@ -0,0 +1,112 @@
+import hashlib
+from datetime import datetime
+
+from sqlalchemy.orm import Session
+
+from app import metrics
+from app.config import settings
+from app.database import run_db, with_session
+from app.models import ResumeProfile
+from app.schemas import ResumeProfileOutput
+from app.services import llm_cache, llm_gateway, prompts
+
+PROMPT = prompts.get("resume_profile")
+PROMPT_VERSION = PROMPT.cache_version
+
+# Profile fields each task's prompt needs; the rest of the resume is left out.
+JOB_FIT_FIELDS = ("job_title", "seniority", "skills", "experience_summary")
+MCQ_FIELDS = ("seniority", "skills", "experience_summary")
+JOB_SEARCH_FIELDS = ("job_title", "seniority", "location", "skills")
+
+_LABELS = {
+    "candidate_name": "Name",
+    "job_title": "Current / target title",
+    "seniority": "Seniority",
+    "location": "Location",
+    "skills": "Skills",
+    "experience_summary": "Experience"
+}
+
+
+def content_hash(resume_text: str) -> str:
+    return hashlib.sha256(" ".join(resume_text.split()).encode("utf-8")).hexdigest()
+
+
+def _get_stored(db: Session, key: str):
+    row = db.query(ResumeProfile).filter(ResumeProfile.content_hash == key).first()
+    if row is None or row.prompt_version != PROMPT_VERSION:
+        return None
+    return row.profile
+
+
+def _store(db: Session, key: str, profile: dict) -> None:
+    db.merge(ResumeProfile(
+        content_hash=key,
+        prompt_version=PROMPT_VERSION,
+        model=settings.gemini_model,
+        profile=profile,
+        created_at=datetime.utcnow()
+    ))
+    db.commit()
+
+
+async def get_resume_profile(resume_text: str) -> dict:
+    """
+    Returns the ResumeProfile for this resume's content, extracting and storing it
+    on first use. Concurrent callers for the same resume share one extraction.
+    Raises LLMOutputError if Gemini cannot produce a valid profile.
+    """
+    key = content_hash(resume_text)
+    profile = llm_cache.memory_cache.get(f"profile:{key}")
+    if profile is not None:
+        metrics.incr("resume_profile.memory_hit")
+        return profile
+
+    async def load_or_extract():
+        profile = await run_db(with_session, _get_stored, key)
+        if profile is not None:
+            metrics.incr("resume_profile.db_hit")
+        else:
+            metrics.incr("resume_profile.extracted")
+            result = await llm_gateway.generate_structured(
+                PROMPT.render(), ResumeProfileOutput,
+                context=resume_context(resume_text), system_instruction=PROMPT.system
+            )
+            profile = result.model_dump()
+            await run_db(with_session, _store, key, profile)
+        llm_cache.memory_cache.set(f"profile:{key}", profile)
+        return profile
+
+    return await llm_cache.inflight.do(f"profile:{key}", load_or_extract)
+
+
+def resume_context(resume_text: str) -> str:
+    """
+    The resume as the shared leading block of every full-text prompt, so calls for
+    the same resume can reuse one Gemini cached-content handle.
+    """
+    return f"Candidate Resume:\n{resume_text}"
+
+
+def render_profile(profile: dict, fields) -> str:
+    """
+    Compact plain-text rendering of the requested profile fields for a prompt.
+    """
+    values = {**profile, "location": (profile.get("contact_info") or {}).get("location")}
+    lines = []
+    for field in fields:
+        value = values.get(field)
+        if isinstance(value, list):
+            value = ", ".join(value)
+        if value:
+            lines.append(f"{_LABELS[field]}: {value}")
+    return "\n".join(lines)
+
+
+def candidate_fields(profile: dict) -> dict:
+    return {
+        "candidate_name": profile["candidate_name"],
+        "job_title": profile["job_title"],
+        "contact_info": profile["contact_info"]
+    }
+
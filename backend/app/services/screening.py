@@ -0,0 +1,86 @@
+import asyncio
+import time
+
+from sqlalchemy.orm import Session
+
+from app import metrics
+from app.database import run_db, with_session
+from app.models import Resume
+from app.services.fit_scoring import featurize, fit_scorer
+from app.services.job_fit_analyzer import reanalyze_resume
+from app.services.job_queue import describe_error
+
+_SCAN_BATCH = 500
+
+
+def _scan_resumes(db: Session, vocabulary: set[str]) -> tuple[list[str], list]:
+    """
+    Streams every stored resume and keeps only its scoring features (counts of
+    the JD's terms, and its skills), so the full texts are never all in memory.
+    """
+    ids, features = [], []
+    rows = db.query(Resume.id, Resume.extracted_text).execution_options(yield_per=_SCAN_BATCH)
+    for resume_id, text in rows:
+        ids.append(resume_id)
+        features.append(featurize(text or "", vocabulary))
+    return ids, features
+
+
+def _shortlist(db: Session, job_description: str, top_k: int) -> dict:
+    """
+    Local prefilter: scores every stored resume against the JD with the fit
+    scorer and loads the texts of the best `top_k`.
+    """
+    started = time.perf_counter()
+    jd = featurize(job_description)
+    ids, features = _scan_resumes(db, set(jd.terms))
+    fit = fit_scorer.score(features, [jd])
+    shortlist = [(ids[index], score) for index, score in fit.top_k(0, top_k) if score > 0]
+    texts = dict(
+        db.query(Resume.id, Resume.extracted_text).filter(Resume.id.in_([rid for rid, _ in shortlist])).all()
+    ) if shortlist else {}
+    elapsed = time.perf_counter() - started
+    metrics.incr("screening.resumes_scanned", len(ids))
+    return {
+        "scanned": len(ids),
+        "matched": int((fit.scores[:, 0] > 0).sum()),
+        "elapsed": round(elapsed, 3),
+        "shortlist": [(rid, round(score, 1), texts[rid]) for rid, score in shortlist if rid in texts]
+    }
+
+
+async def screen(job_description: str, top_k: int, concurrency: int, fresh: bool = False):
+    """
+    Screens every stored resume against a JD. Yields ("prefilter", stats) once
+    the local pass has picked the top `top_k`, then ("candidate", dict) for each
+    shortlisted resume in prefilter rank order as its LLM job-fit evaluation
+    completes (at most `concurrency` at a time).
+    """
+    shortlist = await run_db(with_session, _shortlist, job_description, top_k)
+    candidates = shortlist.pop("shortlist")
+    yield "prefilter", {**shortlist, "shortlisted": len(candidates)}
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def evaluate(resume_text: str) -> dict:
+        async with semaphore:
+            try:
+                return await reanalyze_resume(resume_text, job_description, fresh=fresh)
+            except Exception as e:
+                error, _ = describe_error(e)
+                return {"error": error["detail"]}
+
+    tasks = [asyncio.create_task(evaluate(text)) for _, _, text in candidates]
+    try:
+        for rank, ((resume_id, prefilter_score, _), task) in enumerate(zip(candidates, tasks), start=1):
+            job_fit_data = await task
+            metrics.incr("screening.evaluated" if "error" not in job_fit_data else "screening.failed")
+            yield "candidate", {
+                "resume_id": resume_id,
+                "prefilter_rank": rank,
+                "prefilter_score": prefilter_score,
+                "job_fit": job_fit_data
+            }
+    finally:
+        for task in tasks:
+            task.cancel()
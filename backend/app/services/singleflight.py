@@ -0,0 +1,57 @@
+import asyncio
+
+from app import metrics
+
+
+class _Call:
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key onto one in-flight task.
+
+    The shared task is shielded from any single caller's cancellation (e.g. a
+    client disconnect) and is only cancelled once every waiter has gone away.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: dict[str, _Call] = {}
+
+    def _start(self, key: str, fn) -> _Call:
+        call = _Call(asyncio.ensure_future(fn()))
+        self._calls[key] = call
+
+        def _forget(_):
+            if self._calls.get(key) is call:
+                del self._calls[key]
+            metrics.set_gauge(f"singleflight.{self.name}.in_flight", len(self._calls))
+
+        call.task.add_done_callback(_forget)
+        metrics.set_gauge(f"singleflight.{self.name}.in_flight", len(self._calls))
+        return call
+
+    async def do(self, key: str, fn):
+        call = self._calls.get(key)
+        if call is None:
+            call = self._start(key, fn)
+            metrics.incr(f"singleflight.{self.name}.leader")
+        else:
+            metrics.incr(f"singleflight.{self.name}.coalesced")
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            if call.waiters == 1 and not call.task.done():
+                call.task.cancel()
+                metrics.incr(f"singleflight.{self.name}.cancelled")
+            raise
+        finally:
+            call.waiters -= 1
+
+    def in_flight(self) -> int:
+        return len(self._calls)
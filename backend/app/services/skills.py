@@ -0,0 +1,193 @@
+"""
+Local skill extraction against a bundled skill taxonomy.
+
+Every canonical skill name and alias in the taxonomy is compiled into one regular
+expression shaped like a character trie, so the C regex engine walks the text once,
+left to right, trying all skills at each position together instead of one pattern
+per skill (the same idea as an Aho-Corasick automaton). Matches are whole words,
+prefer the longest alias at a position ("React Native" over "React"), and carry
+character offsets.
+
+Entries are {"name", "category", "aliases", "case_sensitive_aliases"?,
+"case_sensitive"?}. Skills whose names are also ordinary words ("Swift", "Rust") are
+case_sensitive; short forms that are ("REST", "Spark", "Lambda") go in
+case_sensitive_aliases, so "the rest of the day" is not a skill. Set
+SKILL_TAXONOMY_PATH to a JSON file of extra entries to extend or override the
+bundled list (an entry with an existing name replaces it).
+
+    python -m app.services.skills [resume.txt]   # extracted skills + timing
+"""
+import json
+import re
+import sys
+import timeit
+from pathlib import Path
+from typing import NamedTuple
+
+from app.config import settings
+
+TAXONOMY_PATH = Path(__file__).resolve().parent.parent / "data" / "skill_taxonomy.json"
+
+# a skill must not be glued to other word characters ("go" in "google", "c" in "c++"),
+# and a trailing ".x" means a longer dotted name ("node" in "node.jsx")
+_BEFORE = r"(?<![\w+#.&])"
+_AFTER = r"(?![\w+#&]|\.\w)"
+
+
+class SkillMatch(NamedTuple):
+    skill: str
+    category: str
+    start: int
+    end: int
+    text: str
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.split())
+
+
+def load_taxonomy(extra_path: str | None = None) -> list[dict]:
+    entries = {entry["name"]: entry for entry in json.loads(TAXONOMY_PATH.read_text(encoding="utf-8"))}
+    if extra_path:
+        for entry in json.loads(Path(extra_path).read_text(encoding="utf-8")):
+            entries[entry["name"]] = {"aliases": [], **entry}
+    return list(entries.values())
+
+
+def _trie_pattern(terms) -> str:
+    """
+    Regex for a set of terms, factored by shared prefixes, e.g. {"java",
+    "javascript", "jax"} -> "ja(?:va(?:script)?|x)". Alternatives are tried
+    longest-first, so the longest term wins at any position.
+    """
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def render(node) -> str:
+        terminal = "" in node
+        branches = []
+        for char in sorted(key for key in node if key):
+            piece = r"\s+" if char == " " else re.escape(char)
+            branches.append(piece + render(node[char]))
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if terminal:
+            body = f"(?:{body})?" if len(branches) == 1 else body + "?"
+        return body
+
+    return render(trie)
+
+
+class SkillMatcher:
+    def __init__(self, entries: list[dict]):
+        self.categories: dict[str, str] = {}
+        # alias -> canonical name; case-insensitive aliases are stored lower-cased
+        self._folded: dict[str, str] = {}
+        self._exact: dict[str, str] = {}
+        for entry in entries:
+            name = entry["name"]
+            self.categories[name] = entry.get("category", "other")
+            target = self._exact if entry.get("case_sensitive") else self._folded
+            for alias in (name, *entry.get("aliases", ())):
+                alias = _normalize(alias)
+                target[alias if target is self._exact else alias.lower()] = name
+            for alias in entry.get("case_sensitive_aliases", ()):
+                self._exact[_normalize(alias)] = name
+
+        # one trie over every alias, lower-cased; case-sensitive hits are checked
+        # against the original text afterwards
+        terms = {*self._folded, *(alias.lower() for alias in self._exact)}
+        source = f"{_BEFORE}(?:{_trie_pattern(terms) or '(?!)'}){_AFTER}"
+        # matching lower-cased text is about twice as fast as re.IGNORECASE
+        self._pattern = re.compile(source)
+        self._pattern_ci = re.compile(source, re.IGNORECASE)
+
+    def find(self, text: str) -> list[SkillMatch]:
+        """
+        Every skill mention in `text`, in order, with character offsets.
+        """
+        lowered = text.lower()
+        if len(lowered) == len(text):
+            found = self._pattern.finditer(lowered)
+        else:
+            # a few non-ASCII characters change length when lower-cased, which would shift offsets
+            found = self._pattern_ci.finditer(text)
+
+        folded, exact, categories = self._folded, self._exact, self.categories
+        matches = []
+        for match in found:
+            start, end = match.span()
+            original = text[start:end]
+            key = original.lower()
+            skill = folded.get(key) or exact.get(original)
+            if skill is None and not key.isalnum():
+                # multi-word alias matched across a line break or double space
+                skill = folded.get(_normalize(key)) or exact.get(_normalize(original))
+            if skill:
+                matches.append(SkillMatch(skill, categories[skill], start, end, original))
+        return matches
+
+    def extract(self, text: str) -> list[str]:
+        """
+        Canonical names of the skills mentioned in `text`, in order of first mention.
+        """
+        return list(dict.fromkeys(match.skill for match in self.find(text)))
+
+    def by_category(self, text: str) -> dict[str, list[str]]:
+        grouped = {}
+        for skill in self.extract(text):
+            grouped.setdefault(self.categories[skill], []).append(skill)
+        return grouped
+
+    def compare(self, resume_text: str, job_description: str) -> tuple[list[str], list[str]]:
+        """
+        (matched, missing): JD skills the resume mentions, and the ones it doesn't.
+        """
+        resume_skills = set(self.extract(resume_text))
+        jd_skills = self.extract(job_description)
+        return (
+            [skill for skill in jd_skills if skill in resume_skills],
+            [skill for skill in jd_skills if skill not in resume_skills]
+        )
+
+
+skill_matcher = SkillMatcher(load_taxonomy(settings.skill_taxonomy_path))
+
+
+_SAMPLE_RESUME = """
+Jane Doe - Senior Backend Engineer - Bengaluru, IN - jane.doe@example.com
+
+Summary: 7 years building distributed systems and REST APIs in Python, Go and TypeScript.
+Led the migration of a monolith to microservices on Kubernetes (EKS) with Terraform and
+GitHub Actions CI/CD; cut p99 latency by 40% with Redis caching and Kafka-based async pipelines.
+
+Experience
+- Acme Corp (2020-present): FastAPI and Django services backed by PostgreSQL and MongoDB;
+  event streaming with Apache Kafka; observability with Prometheus, Grafana and the ELK stack.
+- Globex (2017-2020): Node.js / Express.js APIs, React and Next.js frontends, Jest and Cypress
+  testing, Docker-based local environments, AWS Lambda, S3 and DynamoDB.
+
+Skills: Python, Go, Java, C++, JavaScript (ES6), TypeScript, SQL, Bash, React Native, GraphQL,
+gRPC, Spark, Airflow, Pandas, NumPy, scikit-learn, PyTorch, NLP, LLMs, Agile/Scrum, Jira, Git, Linux.
+Education: B.Tech Computer Science; coursework in data structures, algorithms and OOP.
+"""
+
+
+def benchmark(text: str, number: int = 2000) -> dict:
+    per_call = min(timeit.repeat(lambda: skill_matcher.find(text), number=number, repeat=5)) / number
+    return {
+        "chars": len(text),
+        "skills": len(skill_matcher.extract(text)),
+        "microseconds_per_extraction": round(per_call * 1e6, 1)
+    }
+
+
+if __name__ == "__main__":
+    sample = Path(sys.argv[1]).read_text(encoding="utf-8") if len(sys.argv) > 1 else _SAMPLE_RESUME
+    print(json.dumps(skill_matcher.by_category(sample), indent=2))
+    print(json.dumps(benchmark(sample)))
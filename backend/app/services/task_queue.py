@@ -0,0 +1,182 @@
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import Task
+
+
+def enqueue(db: Session, kind: str, payload: dict, fresh: bool = False, delay: float = 0,
+            dedupe_key: str | None = None) -> Task:
+    """
+    Queues a task to become runnable in `delay` seconds. With a `dedupe_key`, a
+    queued or running task with the same key is returned instead of adding another.
+    """
+    if dedupe_key:
+        pending = (
+            db.query(Task)
+            .filter(Task.dedupe_key == dedupe_key, Task.status.in_(("queued", "running")))
+            .first()
+        )
+        if pending:
+            return pending
+    task = Task(
+        id=uuid.uuid4().hex,
+        kind=kind,
+        payload=payload,
+        fresh=fresh,
+        status="queued",
+        attempts=0,
+        max_attempts=settings.task_max_attempts,
+        available_at=datetime.utcnow() + timedelta(seconds=delay),
+        dedupe_key=dedupe_key
+    )
+    db.add(task)
+    db.commit()
+    db.refresh(task)
+    return task
+
+
+def get_task(db: Session, task_id: str) -> Task | None:
+    return db.query(Task).filter(Task.id == task_id).first()
+
+
+def claim(db: Session, worker_id: str, limit: int, lease_seconds: float) -> list[dict]:
+    """
+    Claims up to `limit` runnable tasks for `worker_id`: queued tasks that are due,
+    and running tasks whose lease expired (their worker died or stalled). Rows
+    locked by another worker's claim are skipped rather than waited on, so any
+    number of workers can poll the same table. A task whose lease expired on its
+    last attempt is dead-lettered instead.
+    """
+    now = datetime.utcnow()
+    rows = (
+        db.query(Task)
+        .filter(Task.status.in_(("queued", "running")), Task.available_at <= now)
+        .order_by(Task.available_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+
+    claimed = []
+    for task in rows:
+        if task.attempts >= task.max_attempts:
+            task.status = "dead"
+            task.error = {"status_code": 504, "detail": "Visibility timeout exceeded on final attempt"}
+            task.finished_at = now
+            continue
+        if task.queue_seconds is None:
+            task.queue_seconds = (now - task.created_at).total_seconds()
+        task.status = "running"
+        task.attempts += 1
+        task.worker_id = worker_id
+        task.started_at = now
+        task.available_at = now + timedelta(seconds=lease_seconds)
+        claimed.append({
+            "id": task.id,
+            "kind": task.kind,
+            "payload": task.payload,
+            "fresh": task.fresh,
+            "attempt": task.attempts
+        })
+    db.commit()
+    return claimed
+
+
+def _owned(db: Session, task_id: str, worker_id: str, attempt: int):
+    # a task whose lease expired may have been re-claimed; the old worker must not touch it
+    return db.query(Task).filter(
+        Task.id == task_id,
+        Task.worker_id == worker_id,
+        Task.attempts == attempt,
+        Task.status == "running"
+    )
+
+
+def heartbeat(db: Session, task_id: str, worker_id: str, attempt: int, lease_seconds: float) -> bool:
+    updated = _owned(db, task_id, worker_id, attempt).update(
+        {Task.available_at: datetime.utcnow() + timedelta(seconds=lease_seconds)},
+        synchronize_session=False
+    )
+    db.commit()
+    return updated == 1
+
+
+def complete(db: Session, task_id: str, worker_id: str, attempt: int, result, run_seconds: float) -> bool:
+    updated = _owned(db, task_id, worker_id, attempt).update(
+        {
+            Task.status: "succeeded",
+            Task.result: result,
+            Task.error: None,
+            Task.finished_at: datetime.utcnow(),
+            Task.run_seconds: run_seconds
+        },
+        synchronize_session=False
+    )
+    db.commit()
+    return updated == 1
+
+
+def fail(db: Session, task_id: str, worker_id: str, attempt: int, error: dict,
+         retryable: bool, run_seconds: float) -> str | None:
+    """
+    Records a failed attempt. Retryable failures are re-queued with a linearly
+    growing delay until max_attempts is reached, then dead-lettered; others fail
+    immediately. Returns the new status, or None if the task is no longer ours.
+    """
+    task = _owned(db, task_id, worker_id, attempt).with_for_update().first()
+    if not task:
+        db.rollback()
+        return None
+
+    now = datetime.utcnow()
+    task.error = error
+    task.run_seconds = run_seconds
+    if retryable and task.attempts < task.max_attempts:
+        task.status = "queued"
+        task.worker_id = None
+        task.available_at = now + timedelta(seconds=settings.task_retry_delay * task.attempts)
+    else:
+        task.status = "dead" if retryable else "failed"
+        task.finished_at = now
+    db.commit()
+    return task.status
+
+
+def requeue_dead(db: Session, kind: str | None = None) -> int:
+    """
+    Moves dead-lettered tasks back to the queue with a fresh attempt budget.
+    """
+    query = db.query(Task).filter(Task.status == "dead")
+    if kind:
+        query = query.filter(Task.kind == kind)
+    count = query.update(
+        {
+            Task.status: "queued",
+            Task.attempts: 0,
+            Task.worker_id: None,
+            Task.available_at: datetime.utcnow(),
+            Task.finished_at: None
+        },
+        synchronize_session=False
+    )
+    db.commit()
+    return count
+
+
+def task_dict(task: Task) -> dict:
+    return {
+        "job_id": task.id,
+        "kind": task.kind,
+        "status": task.status,
+        "attempts": task.attempts,
+        "created_at": task.created_at,
+        "started_at": task.started_at,
+        "finished_at": task.finished_at,
+        "queue_seconds": task.queue_seconds,
+        "run_seconds": task.run_seconds,
+        "result": task.result,
+        "error": task.error
+    }
@@ -0,0 +1,38 @@
+import json
+from fastapi.responses import StreamingResponse
+from .services.llm_errors import LLMError
+
+def sse_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+def sse_response(events) -> StreamingResponse:
+    """
+    Wraps an async iterator of sse_event() strings in a text/event-stream response.
+    """
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def task_events(events, on_result):
+    """
+    Converts a service's streamed task events into SSE events. "field" and "item"
+    events pass through; the final result goes through `on_result` (which persists
+    it and returns the payload to send). Failures become an "error" event, since
+    the 200 status has already been sent.
+    """
+    try:
+        async for kind, payload in events:
+            if kind == "field":
+                name, value = payload
+                yield sse_event("field", {"name": name, "value": value})
+            elif kind == "item":
+                name, index, value = payload
+                yield sse_event("item", {"name": name, "index": index, "value": value})
+            elif "error" in payload:
+                yield sse_event("error", {"detail": payload["error"]})
+            else:
+                yield sse_event("result", await on_result(payload))
+    except LLMError as e:
+        yield sse_event("error", {"detail": str(e), "retry_after": e.retry_after})
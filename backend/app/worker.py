@@ -0,0 +1,150 @@
+"""
+Task queue worker for the "db" job backend.
+
+Claims jobs from the tasks table with SELECT ... FOR UPDATE SKIP LOCKED and runs
+them through the same handlers as the synchronous endpoints, so results land in
+the usual tables. Start the API with JOB_BACKEND=db and run any number of
+
+    python -m app.worker --concurrency 8
+
+on any machine that can reach the database. Each running task holds a lease that
+the worker extends while it works; if a worker dies the lease expires and another
+worker picks the task up. Failed attempts are retried with a growing delay and
+dead-lettered (status "dead") after TASK_MAX_ATTEMPTS; `--requeue-dead` puts them
+back on the queue.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import socket
+import time
+
+from fastapi.encoders import jsonable_encoder
+
+from app import metrics
+from app.config import settings
+from app.database import db_executor, init_db, run_db, with_session
+from app.routes.jobs import job_manager
+from app.services import llm_gateway, task_queue
+from app.services.job_queue import describe_error
+
+logger = logging.getLogger("app.worker")
+
+
+class Worker:
+    def __init__(self, concurrency: int, poll_interval: float, lease_seconds: float):
+        self.id = f"{socket.gethostname()}:{os.getpid()}"
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self._running: set[asyncio.Task] = set()
+        self._stop = None
+
+    def stop(self) -> None:
+        logger.info("worker %s stopping after %d running task(s)", self.id, len(self._running))
+        self._stop.set()
+
+    async def run(self) -> None:
+        self._stop = asyncio.Event()
+        logger.info("worker %s started, concurrency %d", self.id, self.concurrency)
+        while not self._stop.is_set():
+            free = self.concurrency - len(self._running)
+            claimed = []
+            if free > 0:
+                claimed = await run_db(with_session, task_queue.claim, self.id, free, self.lease_seconds)
+                for task in claimed:
+                    running = asyncio.create_task(self._process(task))
+                    self._running.add(running)
+                    running.add_done_callback(self._running.discard)
+            if len(claimed) < free or free == 0:
+                await self._idle(full=free == 0)
+
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+
+    async def _idle(self, full: bool) -> None:
+        # sleep until the poll interval passes, a slot frees up, or we are told to stop
+        stop = asyncio.ensure_future(self._stop.wait())
+        waiters = {stop, *self._running} if full else {stop}
+        await asyncio.wait(waiters, timeout=self.poll_interval, return_when=asyncio.FIRST_COMPLETED)
+        stop.cancel()
+
+    async def _heartbeat(self, task: dict) -> None:
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            owned = await run_db(
+                with_session, task_queue.heartbeat, task["id"], self.id, task["attempt"], self.lease_seconds
+            )
+            if not owned:
+                return
+
+    async def _process(self, task: dict) -> None:
+        request_model, handler = job_manager.handlers[task["kind"]]
+        heartbeat = asyncio.create_task(self._heartbeat(task))
+        started = time.perf_counter()
+        try:
+            request = request_model.model_validate(task["payload"])
+            result = jsonable_encoder(await handler(request, task["fresh"]))
+        except Exception as e:
+            error, retryable = describe_error(e)
+            status = await run_db(
+                with_session, task_queue.fail, task["id"], self.id, task["attempt"],
+                error, retryable, time.perf_counter() - started
+            )
+            metrics.incr(f"tasks.{task['kind']}.{status or 'lost'}")
+            logger.warning("task %s (%s) attempt %d failed -> %s: %s",
+                           task["id"], task["kind"], task["attempt"], status, error["detail"])
+        else:
+            owned = await run_db(
+                with_session, task_queue.complete, task["id"], self.id, task["attempt"],
+                result, time.perf_counter() - started
+            )
+            metrics.incr(f"tasks.{task['kind']}.{'succeeded' if owned else 'lost'}")
+        finally:
+            heartbeat.cancel()
+
+
+async def _serve(worker: Worker) -> None:
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, worker.stop)
+        except NotImplementedError:
+            # Windows: Ctrl+C surfaces as KeyboardInterrupt instead
+            pass
+    try:
+        await worker.run()
+    finally:
+        await llm_gateway.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run analysis tasks from the database queue")
+    parser.add_argument("--concurrency", type=int, default=settings.worker_concurrency)
+    parser.add_argument("--poll-interval", type=float, default=settings.worker_poll_interval)
+    parser.add_argument("--visibility-timeout", type=float, default=settings.task_visibility_timeout)
+    parser.add_argument("--requeue-dead", nargs="?", const="", metavar="KIND",
+                        help="move dead-lettered tasks (optionally of one kind) back to the queue and exit")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+    init_db()
+
+    if args.requeue_dead is not None:
+        count = with_session(task_queue.requeue_dead, args.requeue_dead or None)
+        print(f"requeued {count} dead task(s)")
+        return
+
+    worker = Worker(args.concurrency, args.poll_interval, args.visibility_timeout)
+    try:
+        asyncio.run(_serve(worker))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        db_executor.shutdown(wait=False)
+
+
+if __name__ == "__main__":
+    main()
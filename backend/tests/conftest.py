@@ -0,0 +1,10 @@
+import os
+import tempfile
+
+# settings are read at import time, so point the app at a throwaway SQLite
+# database and a dummy key before any test imports it
+_db_dir = tempfile.mkdtemp(prefix="ats-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'test.db')}"
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+os.environ["LLM_CONTEXT_CACHE_ENABLED"] = "false"
+os.environ["LLM_FALLBACK"] = "off"
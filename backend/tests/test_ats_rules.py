@@ -0,0 +1,113 @@
+import pytest
+
+from app.services.ats_rules import (
+    RULES, ResumeDocument, bullet_points, contact_info, date_consistency, keyword_stuffing, length,
+    quantified_impact, render_facts, run_rules, sections, text_noise
+)
+
+RESUME = """Jane Doe
+jane.doe@example.com | +91 98765 43210 | linkedin.com/in/janedoe
+
+Experience
+Senior Backend Engineer, Acme Corp, Jan 2020 - Mar 2024
+- Cut p99 latency by 40% with Redis caching
+- Migrated 12 services to Kubernetes
+- Led a team of 5 engineers
+Backend Engineer, Globex, Jun 2017 - Dec 2019
+- Built REST APIs serving 2M users
+- Automated deployments with GitHub Actions
+- Mentored interns
+
+Education
+B.Tech Computer Science, 2013 - 2017
+
+Skills
+Python, Go, PostgreSQL, Kafka, Docker, AWS
+"""
+
+
+def check(rule, text):
+    return rule(ResumeDocument(text))
+
+
+def test_every_rule_reports_a_finding():
+    result = run_rules(RESUME)
+    assert [finding["rule"] for finding in result["findings"]] == list(RULES)
+    for finding in result["findings"]:
+        assert finding["status"] in ("pass", "warn", "fail")
+        assert 0 <= finding["score"] <= 100
+    assert 0 <= result["score"] <= 100
+
+
+def test_render_facts_has_one_line_per_rule():
+    lines = render_facts(run_rules(RESUME)).splitlines()
+    assert len(lines) == len(RULES)
+    assert lines[0].startswith("- sections (pass): ")
+
+
+def test_sections():
+    assert check(sections, RESUME)[0] == 1.0
+    score, message = check(sections, "Work Experience\nAcme\nTechnical Skills\nPython")
+    assert score == pytest.approx(2 / 3)
+    assert "Education" in message
+
+
+def test_contact_info():
+    assert check(contact_info, RESUME)[0] == 1.0
+    score, message = check(contact_info, "jane@example.com\n2017-2020 Acme")
+    assert score == 0.5
+    assert message == "Missing: phone, LinkedIn/GitHub link."
+
+
+@pytest.mark.parametrize("words, score", [(50, 0.2), (200, 0.6), (500, 1.0), (1200, 0.6), (2000, 0.2)])
+def test_length(words, score):
+    assert check(length, "word " * words)[0] == score
+
+
+def test_bullet_points_and_quantified_impact():
+    assert check(bullet_points, RESUME)[0] == 1.0
+    assert check(quantified_impact, RESUME)[0] == 1.0
+    plain = "- Built services\n- Wrote docs\n- Fixed bugs"
+    assert check(bullet_points, plain)[0] == 0.6
+    assert check(quantified_impact, plain)[0] == 0.3
+    assert check(quantified_impact, "No bullets here")[0] == 0.3
+
+
+def test_consistent_dates():
+    assert check(date_consistency, RESUME) == (1.0, "Dates are consistent.")
+
+
+@pytest.mark.parametrize("text", [
+    "Acme, 2021 - 2019",
+    "Acme, Mar 2021 to Jan 2019",
+    "Acme, 2021–2019",
+])
+def test_reversed_date_range(text):
+    score, message = check(date_consistency, text)
+    assert score == 0.3
+    assert "2021-2019" in message
+
+
+def test_years_that_are_not_a_range_are_not_reversed():
+    assert check(date_consistency, "Acme 2021. Founded in 1998.")[0] == 1.0
+
+
+def test_mixed_date_formats():
+    assert check(date_consistency, "Jan 2020 - Present\n03/2017 - 12/2019")[0] == 0.6
+
+
+def test_no_dates():
+    assert check(date_consistency, "Python developer")[0] == 0.5
+
+
+def test_keyword_stuffing():
+    assert check(keyword_stuffing, RESUME)[0] == 1.0
+    score, message = check(keyword_stuffing, "python " * 20 + "django flask")
+    assert score == 0.2
+    assert "'python'" in message
+
+
+def test_text_noise():
+    assert check(text_noise, RESUME)[0] == 1.0
+    assert check(text_noise, "Experience (cid:12) at Acme " + "x" * 1000)[0] == 0.8
+    assert check(text_noise, "�" * 5 + "abc")[0] == 0.1
@@ -0,0 +1,47 @@
+from pydantic import BaseModel
+
+from app.services.batcher import match_batch_results, render_batch_items
+
+
+class Score(BaseModel):
+    item_id: int
+    score: int
+
+
+def test_results_follow_input_order_not_reply_order():
+    items = [{"item_id": 2, "score": 30}, {"item_id": 0, "score": 10}, {"item_id": 1, "score": 20}]
+    assert [result.score for result in match_batch_results(items, 3, Score.model_validate)] == [10, 20, 30]
+
+
+def test_missing_ids_become_none():
+    items = [{"item_id": 0, "score": 10}, {"item_id": 2, "score": 30}]
+    results = match_batch_results(items, 3, Score.model_validate)
+    assert [result and result.score for result in results] == [10, None, 30]
+
+
+def test_first_of_duplicate_ids_wins():
+    items = [{"item_id": 0, "score": 10}, {"item_id": 0, "score": 99}, {"item_id": 1, "score": 20}]
+    results = match_batch_results(items, 2, Score.model_validate)
+    assert [result.score for result in results] == [10, 20]
+
+
+def test_invalid_entries_become_none():
+    items = [{"item_id": 0, "score": "high"}, {"item_id": 1, "score": 20}, "junk", {"score": 5}]
+    results = match_batch_results(items, 2, Score.model_validate)
+    assert results[0] is None
+    assert results[1].score == 20
+
+
+def test_ids_may_be_strings_and_out_of_range_ids_are_ignored():
+    items = [{"item_id": "1", "score": 20}, {"item_id": 0, "score": 10}, {"item_id": 7, "score": 70}]
+    assert [result.score for result in match_batch_results(items, 2, Score.model_validate)] == [10, 20]
+
+
+def test_unusable_reply_gives_all_none():
+    assert match_batch_results(None, 2, Score.model_validate) == [None, None]
+    assert match_batch_results({"item_id": 0, "score": 1}, 1, Score.model_validate) == [None]
+    assert match_batch_results([], 0, Score.model_validate) == []
+
+
+def test_render_batch_items_ids_are_positions():
+    assert render_batch_items(["a", "b"]) == '<item id="0">\na\n</item>\n\n<item id="1">\nb\n</item>'
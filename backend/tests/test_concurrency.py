@@ -0,0 +1,62 @@
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+import httpx
+
+from app.main import app
+from app.schemas import ResumeAssessmentOutput, ResumeProfileOutput
+from app.services import llm_gateway
+
+LLM_DELAY = 0.5
+CONCURRENT_REQUESTS = 16
+
+_REPLIES = {
+    ResumeProfileOutput: {
+        "candidate_name": "Jane Doe",
+        "job_title": "Backend Engineer",
+        "contact_info": {"email": "jane@example.com", "location": "Remote"},
+        "seniority": "senior",
+        "skills": ["Python", "PostgreSQL"],
+        "experience_summary": "Backend engineer with seven years of Python."
+    },
+    ResumeAssessmentOutput: {
+        "ats_compatibility_score": 72,
+        "strengths": ["Clear structure"],
+        "weaknesses": ["Few metrics"],
+        "improvement_suggestions": ["Quantify impact"]
+    },
+}
+
+
+async def _slow_generate_content(prompt, config=None, model=None, timeout=None):
+    await asyncio.sleep(LLM_DELAY)
+    return SimpleNamespace(text=json.dumps(_REPLIES[config["response_schema"]]))
+
+
+def test_concurrent_analyses_take_about_one_llm_latency(monkeypatch):
+    monkeypatch.setattr(llm_gateway, "generate_content", _slow_generate_content)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            requests = [
+                client.post("/resume/analyze-text", json={
+                    "id": f"concurrency-{i}",
+                    # distinct texts, so no request is served from the LLM cache
+                    "extracted_text": f"Jane Doe {i}\nExperience\n- Built Python services for team {i}",
+                    "filename": f"resume-{i}.pdf"
+                })
+                for i in range(CONCURRENT_REQUESTS)
+            ]
+            started = time.perf_counter()
+            responses = await asyncio.gather(*requests)
+            return time.perf_counter() - started, responses
+
+    elapsed, responses = asyncio.run(run())
+
+    assert [response.status_code for response in responses] == [200] * CONCURRENT_REQUESTS
+    assert all(response.json()["analysis_result"]["ats_compatibility_score"] == 72 for response in responses)
+    # about one LLM latency plus overhead; serialized handlers would take
+    # CONCURRENT_REQUESTS x LLM_DELAY (8 s)
+    assert elapsed < CONCURRENT_REQUESTS * LLM_DELAY / 3
@@ -0,0 +1,27 @@
+from sqlalchemy import create_engine, inspect, text
+
+from app import models  # noqa: F401  (registers the tables)
+from app.database import _add_missing_columns
+
+
+def test_missing_columns_are_added_to_existing_tables():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        # job_fit_analysis as created before source/status/refined_at existed
+        conn.execute(text(
+            "CREATE TABLE job_fit_analysis (id VARCHAR PRIMARY KEY, resume_id VARCHAR, job_description_id VARCHAR, "
+            "job_fit_score INTEGER, gap_summary TEXT, strengths JSON, matched_skills JSON, missing_skills JSON, "
+            "recommendations JSON, candidate_name VARCHAR, candidate_title VARCHAR, candidate_email VARCHAR, "
+            "candidate_location VARCHAR, created_at DATETIME)"
+        ))
+        conn.execute(text("INSERT INTO job_fit_analysis (id, job_fit_score) VALUES ('old', 50)"))
+
+    with engine.begin() as conn:
+        added = _add_missing_columns(conn)
+    assert added == ["job_fit_analysis.source", "job_fit_analysis.status", "job_fit_analysis.refined_at"]
+
+    with engine.begin() as conn:
+        assert _add_missing_columns(conn) == []
+        row = conn.execute(text("SELECT source, status, refined_at FROM job_fit_analysis")).one()
+    assert tuple(row) == ("llm", "final", None)
+    assert {"source", "status", "refined_at"} <= {c["name"] for c in inspect(engine).get_columns("job_fit_analysis")}
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from app.services.fit_scoring import FitScorer, featurize, score_fit
+
+RESUMES = [
+    "Backend engineer: Python, Django and PostgreSQL on AWS.",
+    "Frontend developer: React, TypeScript and CSS.",
+    "Data engineer: Python, Apache Spark, Airflow and PostgreSQL.",
+]
+JDS = [
+    "Python Django engineer with PostgreSQL and Kubernetes.",
+    "React and TypeScript frontend developer.",
+]
+
+scorer = FitScorer()
+
+
+def test_scores_every_resume_against_every_jd():
+    matrix = scorer.score_texts(RESUMES, JDS)
+    assert matrix.scores.shape == (3, 2)
+    assert matrix.skill_scores.shape == matrix.term_scores.shape == (3, 2)
+    assert ((matrix.scores >= 0) & (matrix.scores <= 100)).all()
+
+
+def test_each_jd_is_scored_independently():
+    matrix = scorer.score_texts(RESUMES, JDS)
+    for j, jd in enumerate(JDS):
+        alone = scorer.score_texts(RESUMES, [jd])
+        assert np.allclose(alone.scores[:, 0], matrix.scores[:, j])
+
+
+def test_scoring_is_deterministic():
+    first = scorer.score_texts(RESUMES, JDS).scores
+    assert np.array_equal(first, scorer.score_texts(RESUMES, JDS).scores)
+
+
+@pytest.mark.parametrize("resumes, jds, shape", [
+    ([], JDS, (0, 2)),
+    (RESUMES, [], (3, 0)),
+    ([], [], (0, 0)),
+])
+def test_empty_batches(resumes, jds, shape):
+    assert scorer.score_texts(resumes, jds).scores.shape == shape
+
+
+def test_empty_texts_score_zero():
+    matrix = scorer.score_texts(["", "   "], ["", "the and of"])
+    assert matrix.scores.tolist() == [[0.0, 0.0], [0.0, 0.0]]
+
+
+def test_top_k_is_best_first():
+    matrix = scorer.score_texts(RESUMES, JDS)
+    top = matrix.top_k(0, 2)
+    assert [index for index, _ in top] == [0, 2]
+    assert top[0][1] >= top[1][1]
+    assert matrix.top_k(1, 1)[0][0] == 1
+
+
+def test_top_k_bounds():
+    matrix = scorer.score_texts(RESUMES, JDS)
+    assert len(matrix.top_k(0, 10)) == 3
+    assert matrix.top_k(0, 0) == []
+    assert scorer.score_texts([], JDS).top_k(0, 5) == []
+
+
+def test_top_k_breaks_ties_by_resume_order():
+    matrix = scorer.score_texts(["Python", "Java", "Python"], ["Python developer"])
+    assert [index for index, _ in matrix.top_k(0, 3)] == [0, 2, 1]
+
+
+def test_explain_lists_matched_and_missing_skills():
+    result = score_fit(RESUMES[0], JDS[0])
+    assert result["matched_skills"] == ["Django", "PostgreSQL", "Python"]
+    assert result["missing_skills"] == ["Kubernetes"]
+    assert result["skill_score"] == 75.0
+
+
+def test_vocabulary_limits_resume_terms():
+    features = featurize("Python Django Rust", vocabulary={"python"})
+    assert dict(features.terms) == {"python": 1}
+    assert features.length == 3
@@ -0,0 +1,33 @@
+import time
+
+from app.services.admission import AdmissionRejected
+from app.services.job_queue import Job, JobManager, describe_error
+from app.services.llm_errors import LLMUnavailableError
+
+
+def test_rejected_admission_is_recorded_as_429_with_retry_after():
+    error, retryable = describe_error(AdmissionRejected("queue full", 7))
+    assert error["status_code"] == 429
+    assert error["retry_after"] == 7
+    assert retryable
+
+
+def test_unavailable_llm_is_recorded_as_503():
+    error, retryable = describe_error(LLMUnavailableError("Gemini request failed", 30))
+    assert error == {"status_code": 503, "detail": "Gemini request failed", "retry_after": 30}
+    assert retryable
+
+
+def test_prune_drops_expired_jobs_behind_a_running_one():
+    manager = JobManager(workers=1, max_pending=10, retention=60)
+    now = time.time()
+    running = Job("analyze", None, False)
+    manager.jobs[running.id] = running
+    for finished_at in (now - 120, now - 90, now - 10):
+        job = Job("analyze", None, False)
+        job.finished_at = finished_at
+        manager.jobs[job.id] = job
+
+    manager._prune()
+
+    assert [job.finished_at for job in manager.jobs.values()] == [None, now - 10]
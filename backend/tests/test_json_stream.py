@@ -0,0 +1,132 @@
+import json
+import random
+
+import pytest
+
+from app.services.json_stream import IncrementalJSONParser
+
+DOCUMENTS = [
+    {
+        "summary": "Backend engineer, \"senior\" {not a brace} [nor a bracket]",
+        "score": 87,
+        "ratio": -0.5e-3,
+        "remote": True,
+        "manager": None,
+        "skills": ["Python", "Go", "C++"],
+        "mcqs": [
+            {"question": "Escapes: \\ \" \n é ☃", "options": ["a", "b"], "answer": "a"},
+            {"question": "Nested", "options": [[1, 2], {"k": [3]}], "answer": "b"},
+        ],
+        "empty_list": [],
+        "empty_object": {},
+    },
+    [{"id": 1, "text": "first, with a comma"}, {"id": 2, "text": "second ]"}, 3, "four", None],
+    [],
+    {},
+]
+
+
+def feed_all(text: str, cuts: list[int], **kwargs):
+    parser = IncrementalJSONParser(**kwargs)
+    events = []
+    bounds = [0, *cuts, len(text)]
+    for start, end in zip(bounds, bounds[1:]):
+        events.extend(parser.feed(text[start:end]))
+    return parser, events
+
+
+def wrapped(document, indent=None) -> str:
+    return "Here you go:\n```json\n" + json.dumps(document, indent=indent) + "\n```\nHope that helps."
+
+
+@pytest.mark.parametrize("document", DOCUMENTS)
+@pytest.mark.parametrize("indent", [None, 2])
+def test_value_equals_json_loads_across_arbitrary_splits(document, indent):
+    text = wrapped(document, indent)
+    rng = random.Random(len(text))
+    for _ in range(100):
+        cuts = sorted(rng.sample(range(1, len(text)), rng.randint(1, min(20, len(text) - 1))))
+        parser, _ = feed_all(text, cuts)
+        assert parser.done
+        assert parser.value() == json.loads(json.dumps(document))
+
+
+@pytest.mark.parametrize("document", DOCUMENTS)
+def test_one_character_at_a_time(document):
+    text = wrapped(document)
+    parser, _ = feed_all(text, list(range(1, len(text))))
+    assert parser.value() == document
+
+
+def test_events_for_root_object():
+    document = DOCUMENTS[0]
+    text = json.dumps(document)
+    _, whole = feed_all(text, [])
+    _, split = feed_all(text, list(range(7, len(text), 7)))
+    assert whole == split
+    fields = [payload for kind, payload in whole if kind == "field"]
+    assert fields == list(document.items())
+    items = [payload for kind, payload in whole if kind == "item"]
+    assert [(key, index) for key, index, _ in items] == [
+        ("skills", 0), ("skills", 1), ("skills", 2), ("mcqs", 0), ("mcqs", 1)
+    ]
+    assert items[3][2] == document["mcqs"][0]
+
+
+def test_events_for_root_array():
+    document = DOCUMENTS[1]
+    _, events = feed_all(json.dumps(document), [])
+    assert events == [("item", (None, index, value)) for index, value in enumerate(document)]
+
+
+def test_items_are_emitted_as_soon_as_they_close():
+    parser = IncrementalJSONParser()
+    assert parser.feed('{"mcqs": [{"q": 1}, {"q"') == [("item", ("mcqs", 0, {"q": 1}))]
+    assert parser.feed(': 2}') == []
+    assert parser.feed(']') == [("item", ("mcqs", 1, {"q": 2}))]
+    assert parser.feed('}') == [("field", ("mcqs", [{"q": 1}, {"q": 2}]))]
+    assert parser.done
+
+
+def test_truncated_stream_has_no_value():
+    text = json.dumps(DOCUMENTS[0])
+    parser, _ = feed_all(text[:len(text) // 2], [])
+    assert not parser.done
+    with pytest.raises(ValueError):
+        parser.value()
+
+
+def test_invalid_value_is_reported():
+    parser, _ = feed_all('{"a": 1, "b": tru, "c": 3}', [])
+    assert parser.done
+    with pytest.raises(ValueError):
+        parser.value()
+
+
+def test_text_after_the_root_value_is_ignored():
+    parser = IncrementalJSONParser()
+    parser.feed('{"a": 1}')
+    assert parser.feed('{"b": 2}') == []
+    assert parser.value() == {"a": 1}
+
+
+def test_raw_text_is_kept_only_when_asked_for():
+    text = wrapped(DOCUMENTS[1])
+    parser, _ = feed_all(text, [10, 20])
+    assert parser.chars == len(text)
+    with pytest.raises(ValueError):
+        parser.text
+    parser, _ = feed_all(text, [10, 20], keep_text=True)
+    assert parser.text == text
+
+
+def test_buffer_stays_bounded_on_long_streams():
+    document = {"mcqs": [{"question": f"Question {n}", "options": ["a", "b", "c", "d"]} for n in range(2000)]}
+    text = json.dumps(document)
+    parser = IncrementalJSONParser()
+    largest = 0
+    for start in range(0, len(text), 64):
+        parser.feed(text[start:start + 64])
+        largest = max(largest, len(parser._buf))
+    assert parser.value() == document
+    assert largest < 1000 < len(text)
@@ -0,0 +1,82 @@
+import pytest
+
+from app.services.skills import SkillMatch, SkillMatcher, load_taxonomy
+
+matcher = SkillMatcher(load_taxonomy())
+
+
+@pytest.mark.parametrize("text", [
+    "the rest of the day",
+    "swift delivery of every order",
+    "a spark of creativity",
+    "wrote a lambda function",
+    "Node based routing",
+    "configured ts-node",
+    "Excel at communication",
+    "excel in teamwork",
+    "rust on the pipes",
+    "at the helm of the team",
+    "said in jest",
+    "an assembly line",
+    "5 ml of water",
+    "embedded in the sales team",
+])
+def test_ordinary_words_are_not_skills(text):
+    assert matcher.extract(text) == []
+
+
+def test_ambiguous_short_forms_match_as_written():
+    text = "Built REST APIs on AWS Lambda and Spark in TS; Swift, Rust, ML; Advanced Excel"
+    assert matcher.extract(text) == [
+        "REST APIs", "AWS Lambda", "Apache Spark", "TypeScript", "Swift", "Rust", "Machine Learning",
+        "Microsoft Excel"
+    ]
+
+
+small = SkillMatcher([
+    {"name": "React", "category": "frontend", "aliases": ["ReactJS"]},
+    {"name": "React Native", "category": "mobile", "aliases": []},
+    {"name": "Java", "category": "language", "aliases": []},
+    {"name": "JavaScript", "category": "language", "aliases": ["JS"]},
+    {"name": "C++", "category": "language", "aliases": ["cpp"]},
+    {"name": "Go", "category": "language", "aliases": ["Golang"], "case_sensitive": True},
+    {"name": "REST APIs", "category": "backend", "aliases": [], "case_sensitive_aliases": ["REST"]},
+])
+
+
+def test_matches_carry_offsets_into_the_original_text():
+    text = "Used reactjs, C++ and Golang."
+    assert small.find(text) == [
+        SkillMatch("React", "frontend", 5, 12, "reactjs"),
+        SkillMatch("C++", "language", 14, 17, "C++"),
+        SkillMatch("Go", "language", 22, 28, "Golang"),
+    ]
+    for match in small.find(text):
+        assert text[match.start:match.end] == match.text
+
+
+def test_offsets_survive_characters_that_change_length_when_lower_cased():
+    # "İ" lower-cases to two characters
+    text = "İstanbul team, React Native"
+    [match] = small.find(text)
+    assert text[match.start:match.end] == "React Native"
+
+
+def test_longest_alias_wins_at_a_position():
+    assert small.extract("React Native and JavaScript, then React") == ["React Native", "JavaScript", "React"]
+    assert small.extract("React\n  Native") == ["React Native"]
+
+
+def test_skills_must_be_whole_words():
+    assert small.extract("google, javascripts, c++11, reactjs.org") == []
+
+
+def test_case_sensitive_names_and_aliases():
+    assert small.extract("Go and REST") == ["Go", "REST APIs"]
+    assert small.extract("go and rest") == []
+    # the case-insensitive canonical name still matches in any case
+    assert small.extract("rest apis") == ["REST APIs"]
+
+
+def test_compare_splits_jd_skills_into_matched_and_missing():
+    assert small.compare("React and Go", "Go, JavaScript, React") == (["Go", "React"], ["JavaScript"])